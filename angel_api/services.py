@@ -2,20 +2,37 @@
 
 import requests
 import json
+import threading
 import time
 import logging
 import pyotp
 import os
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 from django.utils import timezone
 from SmartApi import SmartConnect
 from .models import AngelOneSession, NSESymbol, MarketData, APILog, Order
 
+# Pooled keep-alive connections shared by every client in the process
+_http = requests.Session()
+# Transient gateway errors are retried with backoff inside the adapter. Retry's
+# default allowed_methods leaves POST out, so orders are never resubmitted.
+_http.mount('https://', HTTPAdapter(
+    pool_connections=20, pool_maxsize=100,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
+_client = None
+_client_lock = threading.Lock()
+
 
 class AngelOneAPI:
     """Service class for Angel One API integration using SmartAPI."""
     
+    LTP_CACHE_TTL = 0.5  # seconds; collapses repeat quotes within one tick
+    
     def __init__(self):
         # Load credentials from config folder (not in git)
         try:
@@ -46,6 +63,14 @@ class AngelOneAPI:
         self.feed_token = None
         self.user_info = None
         self.smart_api = None
+        self._ltp_cache = {}  # symbol -> (monotonic fetch time, ltp)
+    
+    def _cached_ltp(self, symbol):
+        """Return a quote fetched within LTP_CACHE_TTL, or None."""
+        cached = self._ltp_cache.get(symbol)
+        if cached and time.monotonic() - cached[0] < self.LTP_CACHE_TTL:
+            return cached[1]
+        return None
         
     def _log_api_call(self, endpoint, method, request_data, status_code, response_data, response_time_ms, error_message=''):
         """Log API call details."""
@@ -91,9 +116,9 @@ class AngelOneAPI:
             
         try:
             if method.upper() == 'POST':
-                response = requests.post(url, json=data, headers=default_headers, timeout=30)
+                response = _http.post(url, json=data, headers=default_headers, timeout=30)
             else:
-                response = requests.get(url, params=data, headers=default_headers, timeout=30)
+                response = _http.get(url, params=data, headers=default_headers, timeout=30)
             
             response_time_ms = int((time.time() - start_time) * 1000)
             
@@ -233,22 +258,24 @@ class AngelOneAPI:
                 {"symbol": "HINDUNILVR", "token": "356", "name": "Hindustan Unilever Ltd"},
             ]
         
-        # Create or update symbol records in database
-        symbols = []
-        for stock in stocks:
-            symbol_obj, created = NSESymbol.objects.get_or_create(
-                symbol=stock['symbol'],
-                exchange='NSE',
-                defaults={
-                    'token': stock.get('token', ''),
-                    'lot_size': 1,
-                    'instrument_type': 'EQ',
-                    'name': stock.get('name', '')
-                }
-            )
-            symbols.append(stock['symbol'])
+        # Create missing symbol records in a single batched insert
+        NSESymbol.objects.bulk_create(
+            [
+                NSESymbol(
+                    symbol=stock['symbol'],
+                    exchange='NSE',
+                    token=stock.get('token', ''),
+                    lot_size=1,
+                    instrument_type='EQ',
+                    company_name=stock.get('name', '')
+                )
+                for stock in stocks
+            ],
+            batch_size=1000,
+            ignore_conflicts=True
+        )
         
-        self.logger.info(f"Loaded {len(symbols)} NSE symbols into database")
+        self.logger.info(f"Loaded {len(stocks)} NSE symbols into database")
         return stocks
     
     def get_ltp(self, exchange, trading_symbol, symbol_token):
@@ -256,6 +283,10 @@ class AngelOneAPI:
         if not self.smart_api:
             self.logger.error("No active SmartAPI connection")
             return None
+        
+        cached = self._cached_ltp(trading_symbol)
+        if cached is not None:
+            return cached
             
         try:
             # Get LTP using SmartAPI
@@ -265,6 +296,8 @@ class AngelOneAPI:
                 ltp = float(ltp_data['data'].get('ltp', 0))
                 
                 if ltp > 0:  # Valid price
+                    self._ltp_cache[trading_symbol] = (time.monotonic(), ltp)
+                    
                     # Store market data
                     try:
                         nse_symbol, created = NSESymbol.objects.get_or_create(
@@ -343,8 +376,50 @@ class AngelOneAPI:
         self.logger.info(f"Successfully fetched LTP for {len(results)} out of {total_symbols} symbols")
         return results
     
+    def get_ltp_bulk(self, symbols, chunk_size=50):
+        """Get LTPs for NSESymbol rows with one SmartAPI market-data call per chunk of tokens."""
+        if not self.smart_api:
+            self.logger.error("No active SmartAPI connection")
+            return {}
+        
+        prices = {}
+        by_token = {}
+        for s in symbols:
+            cached = self._cached_ltp(s.symbol)
+            if cached is not None:
+                prices[s.symbol] = cached
+            elif s.token:
+                by_token[(s.exchange, str(s.token))] = s.symbol
+        tokens = list(by_token)
+        
+        # LTP mode accepts up to 50 tokens per request
+        for start in range(0, len(tokens), chunk_size):
+            exchange_tokens = {}
+            for exchange, token in tokens[start:start + chunk_size]:
+                exchange_tokens.setdefault(exchange, []).append(token)
+            
+            try:
+                response = self.smart_api.getMarketData('LTP', exchange_tokens)
+            except Exception as e:
+                self.logger.error(f"SmartAPI market data fetch error: {e}")
+                continue
+            
+            if not (response and response.get('status') and response.get('data')):
+                error_msg = response.get('message', 'Failed to get market data') if response else 'No response from SmartAPI'
+                self.logger.error(f"Market data fetch failed: {error_msg}")
+                continue
+            
+            for quote in response['data'].get('fetched', []):
+                symbol = by_token.get((quote.get('exchange'), str(quote.get('symbolToken'))))
+                ltp = float(quote.get('ltp') or 0)
+                if symbol and ltp > 0:
+                    prices[symbol] = ltp
+                    self._ltp_cache[symbol] = (time.monotonic(), ltp)
+        
+        return prices
+    
     def place_order(self, symbol, quantity, price=None, order_type='MARKET', transaction_type='BUY'):
-        """Place an order."""
+        """Place an order, returning (success, order_id or error, average fill price)."""
         self.logger.info(f"Placing {transaction_type} order for {quantity} {symbol} at {price or 'market price'}")
         
         # Placeholder implementation
@@ -364,15 +439,18 @@ class AngelOneAPI:
             # Simulate order execution (for testing)
             order.status = 'COMPLETE'
             order.filled_quantity = quantity
-            order.average_price = price or self.get_ltp(symbol)
+            order.average_price = price or self.get_ltp_bulk([nse_symbol]).get(symbol)
             order.save()
             
+            # Post-fill reads should see a fresh quote
+            self._ltp_cache.pop(symbol, None)
+            
             self.logger.info(f"Order placed successfully: {order.order_id}")
-            return True, order.order_id
+            return True, order.order_id, order.average_price
             
         except Exception as e:
             self.logger.error(f"Error placing order: {e}")
-            return False, str(e)
+            return False, str(e), None
     
     def get_portfolio(self):
         """Get portfolio holdings."""
@@ -527,3 +605,13 @@ class AngelOneAPI:
         return market_data
 
     # ...existing code...
+
+
+def get_client():
+    """Return the process-wide AngelOneAPI client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AngelOneAPI()
+    return _client
@@ -14,7 +14,7 @@ from pyngrok import ngrok, conf
 import json
 
 from .models import AngelOneSession, NSESymbol, MarketData, APILog, Order
-from .services import AngelOneAPI
+from .services import get_client
 from .serializers import (
     AngelOneSessionSerializer, NSESymbolSerializer, MarketDataSerializer,
     APILogSerializer, OrderSerializer, PlaceOrderSerializer, AuthenticationSerializer
@@ -57,7 +57,7 @@ class AuthenticationView(APIView):
     
     def post(self, request):
         try:
-            angel_api = AngelOneAPI()
+            angel_api = get_client()
             
             # Use the simplified authentication method
             success, result = angel_api.authenticate()
@@ -87,7 +87,7 @@ class LTPView(APIView):
     
     def get(self, request, symbol):
         try:
-            angel_api = AngelOneAPI()
+            angel_api = get_client()
             price = angel_api.get_ltp(symbol)
             
             return Response({
@@ -107,7 +107,7 @@ class PortfolioView(APIView):
     
     def get(self, request):
         try:
-            angel_api = AngelOneAPI()
+            angel_api = get_client()
             portfolio = angel_api.get_portfolio()
             
             return Response({
@@ -126,7 +126,7 @@ class BalanceView(APIView):
     
     def get(self, request):
         try:
-            angel_api = AngelOneAPI()
+            angel_api = get_client()
             balance = angel_api.get_balance()
             
             return Response({
@@ -147,9 +147,9 @@ class PlaceOrderView(APIView):
         serializer = PlaceOrderSerializer(data=request.data)
         if serializer.is_valid():
             try:
-                angel_api = AngelOneAPI()
+                angel_api = get_client()
                 
-                success, result = angel_api.place_order(
+                success, result, _ = angel_api.place_order(
                     symbol=serializer.validated_data['symbol'],
                     quantity=serializer.validated_data['quantity'],
                     price=serializer.validated_data.get('price'),
@@ -488,7 +488,7 @@ class FilterStocksView(APIView):
             if limit:
                 limit = int(limit)
             
-            angel_api = AngelOneAPI()
+            angel_api = get_client()
             
             # Authenticate first
             success, message = angel_api.authenticate()
@@ -533,7 +533,7 @@ class LoadSymbolsView(APIView):
     
     def post(self, request):
         try:
-            angel_api = AngelOneAPI()
+            angel_api = get_client()
             nse_stocks, output_file = angel_api.load_nse_symbols_from_master()
             
             if nse_stocks:
@@ -1,6 +1,24 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+    
+    def ready(self):
+        """Connect signal handlers and auto-start ngrok for runserver."""
+        import core.signals
+        
+        # Only the autoreloader parent starts ngrok, so reloads keep the tunnel
+        if (
+            'runserver' in sys.argv
+            and os.environ.get('RUN_MAIN') != 'true'
+            and settings.DEBUG
+            and settings.NGROK_AUTO_START
+        ):
+            from utils.ngrok_auto import autostart
+            autostart()
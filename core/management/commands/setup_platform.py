@@ -2,8 +2,10 @@
 
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from portfolio.services import PortfolioService, TradingSessionService
 from trading.services import TradingStrategyService, TradingBotService
+from core.models import Configuration
 from core.services import ConfigurationService
 
 
@@ -31,99 +33,114 @@ class Command(BaseCommand):
         
         self.stdout.write("Setting up initial trading platform data...")
         
-        # Create admin user
-        user, created = User.objects.get_or_create(
-            username=username,
-            defaults={
-                'first_name': 'Trading',
-                'last_name': 'Admin',
-                'email': f'{username}@example.com',
-                'is_staff': True,
-                'is_superuser': True
-            }
-        )
-        
-        if created:
-            user.set_password(password)
-            user.save()
-            self.stdout.write(f"✓ Created admin user: {username}")
-        else:
-            self.stdout.write(f"✓ Admin user already exists: {username}")
-        
-        # Create portfolio
-        portfolio_service = PortfolioService()
-        portfolio = portfolio_service.get_or_create_portfolio(user)
-        self.stdout.write(f"✓ Portfolio created/verified: ₹{portfolio.current_balance}")
+        # Collect progress messages and emit them once the transaction commits
+        messages = []
         
-        # Create default trading strategy
-        strategy_service = TradingStrategyService()
-        
-        try:
-            strategy = strategy_service.create_news_based_strategy(
-                name="Default News Strategy",
-                config={
-                    'sentiment_threshold': 0.7,
-                    'confidence_threshold': 75,
-                    'max_holding_hours': 24,
-                    'stop_loss_percent': 2.0,
-                    'take_profit_percent': 5.0
+        with transaction.atomic():
+            # Create admin user
+            user, created = User.objects.get_or_create(
+                username=username,
+                defaults={
+                    'first_name': 'Trading',
+                    'last_name': 'Admin',
+                    'email': f'{username}@example.com',
+                    'is_staff': True,
+                    'is_superuser': True
                 }
             )
-            self.stdout.write(f"✓ Created trading strategy: {strategy.name}")
-        except Exception as e:
-            if "UNIQUE constraint failed" in str(e):
-                self.stdout.write("✓ Trading strategy already exists")
+            
+            if created:
+                user.set_password(password)
+                user.save()
+                messages.append(f"✓ Created admin user: {username}")
             else:
-                self.stdout.write(f"✗ Error creating strategy: {e}")
-        
-        # Create trading bot
-        try:
-            from trading.models import TradingStrategy
-            strategy = TradingStrategy.objects.get(name="Default News Strategy")
+                messages.append(f"✓ Admin user already exists: {username}")
             
-            bot_service = TradingBotService()
-            bot = bot_service.create_bot(
-                name="Default Trading Bot",
-                portfolio=portfolio,
-                strategy=strategy,
-                config={
-                    'max_positions': 5,
-                    'position_size': 10.0,
-                    'is_paper_trading': True,
-                    'check_interval_minutes': 10
-                }
+            # Create portfolio
+            portfolio_service = PortfolioService()
+            portfolio = portfolio_service.get_or_create_portfolio(user)
+            messages.append(f"✓ Portfolio created/verified: ₹{portfolio.current_balance}")
+            
+            # Create default trading strategy
+            strategy_service = TradingStrategyService()
+            strategy = None
+            
+            try:
+                with transaction.atomic():
+                    strategy, created = strategy_service.get_or_create_news_based_strategy(
+                        name="Default News Strategy",
+                        config={
+                            'sentiment_threshold': 0.7,
+                            'confidence_threshold': 75,
+                            'max_holding_hours': 24,
+                            'stop_loss_percent': 2.0,
+                            'take_profit_percent': 5.0
+                        }
+                    )
+                if created:
+                    messages.append(f"✓ Created trading strategy: {strategy.name}")
+                else:
+                    messages.append("✓ Trading strategy already exists")
+            except IntegrityError as e:
+                messages.append(f"✗ Error creating strategy: {e}")
+            
+            # Create trading bot
+            if strategy:
+                try:
+                    with transaction.atomic():
+                        bot_service = TradingBotService()
+                        bot, created = bot_service.get_or_create_bot(
+                            name="Default Trading Bot",
+                            portfolio=portfolio,
+                            strategy=strategy,
+                            config={
+                                'max_positions': 5,
+                                'position_size': 10.0,
+                                'is_paper_trading': True,
+                                'check_interval_minutes': 10
+                            }
+                        )
+                    if created:
+                        messages.append(f"✓ Created trading bot: {bot.name}")
+                    else:
+                        messages.append("✓ Trading bot already exists")
+                except IntegrityError as e:
+                    messages.append(f"✗ Error creating bot: {e}")
+            
+            # Set up default configuration
+            config_data = [
+                ('CHECK_INTERVAL', '600', 'Check interval in seconds'),
+                ('MAX_POSITIONS', '10', 'Maximum positions'),
+                ('FIXED_QTY', '20', 'Fixed quantity per trade'),
+                ('MAX_POSITION_SIZE', '0.1', 'Max position size as fraction of portfolio'),
+                ('MAX_LOSS_PERCENT', '0.02', 'Maximum loss per trade'),
+                ('PRICE_THRESHOLD', '200.0', 'Price threshold for stock selection'),
+            ]
+            
+            Configuration.objects.bulk_create(
+                [
+                    Configuration(key=key, value=value, description=description)
+                    for key, value, description in config_data
+                ],
+                update_conflicts=True,
+                unique_fields=['key'],
+                update_fields=['value', 'description', 'updated_at'],
             )
-            self.stdout.write(f"✓ Created trading bot: {bot.name}")
-        except Exception as e:
-            if "UNIQUE constraint failed" in str(e):
-                self.stdout.write("✓ Trading bot already exists")
+            # bulk_create skips post_save, so invalidate cached configuration explicitly
+            ConfigurationService.bump_config_version()
+            
+            messages.append("✓ Default configuration set")
+            
+            # Start trading session
+            session_service = TradingSessionService(portfolio)
+            if not session_service.active_session:
+                session = session_service.start_session()
+                messages.append(f"✓ Started trading session: {session.session_date}")
             else:
-                self.stdout.write(f"✗ Error creating bot: {e}")
-        
-        # Set up default configuration
-        config_data = [
-            ('CHECK_INTERVAL', '600', 'Check interval in seconds'),
-            ('MAX_POSITIONS', '10', 'Maximum positions'),
-            ('FIXED_QTY', '20', 'Fixed quantity per trade'),
-            ('MAX_POSITION_SIZE', '0.1', 'Max position size as fraction of portfolio'),
-            ('MAX_LOSS_PERCENT', '0.02', 'Maximum loss per trade'),
-            ('PRICE_THRESHOLD', '200.0', 'Price threshold for stock selection'),
-        ]
-        
-        for key, value, description in config_data:
-            ConfigurationService.set_config(key, value, description)
-        
-        self.stdout.write("✓ Default configuration set")
-        
-        # Start trading session
-        session_service = TradingSessionService(portfolio)
-        active_session = session_service.get_active_session()
+                messages.append("✓ Trading session already active")
         
-        if not active_session:
-            session = session_service.start_session()
-            self.stdout.write(f"✓ Started trading session: {session.session_date}")
-        else:
-            self.stdout.write("✓ Trading session already active")
+        for message in messages:
+            self.stdout.write(message)
         
         self.stdout.write(
             self.style.SUCCESS(
@@ -1,9 +1,5 @@
 """Django management command to start server with optional ngrok integration."""
 
-import os
-import sys
-import subprocess
-import time
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
 from django.conf import settings
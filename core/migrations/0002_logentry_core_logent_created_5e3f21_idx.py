@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['-created_at', '-id'], name='core_logent_created_5e3f21_idx'),
+        ),
+    ]
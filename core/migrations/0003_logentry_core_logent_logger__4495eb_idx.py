@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_logentry_core_logent_created_5e3f21_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['logger_name', 'level', '-created_at', '-id'], name='core_logent_logger__4495eb_idx'),
+        ),
+    ]
@@ -34,6 +34,8 @@ class LogEntry(TimeStampedModel):
         indexes = [
             models.Index(fields=['level', '-created_at']),
             models.Index(fields=['logger_name', '-created_at']),
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['logger_name', 'level', '-created_at', '-id']),
         ]
     
     def __str__(self):
@@ -0,0 +1,18 @@
+"""Core pagination classes."""
+
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class SmallResultsSetPagination(PageNumberPagination):
+    """Page number pagination with a hard cap on client-requested page sizes."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class LogEntryCursorPagination(CursorPagination):
+    """Keyset pagination for log entries, seeking on (created_at, id)."""
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-created_at', '-id')
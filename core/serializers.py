@@ -4,19 +4,40 @@ from rest_framework import serializers
 from .models import LogEntry, Configuration
 
 
-class LogEntrySerializer(serializers.ModelSerializer):
-    """Serializer for log entries."""
-    
+class LogEntryListSerializer(serializers.ModelSerializer):
+    """Serializer for log entry lists (omits the message body)."""
+
+    class Meta:
+        model = LogEntry
+        fields = ['id', 'level', 'logger_name', 'created_at', 'module', 'function', 'line_number']
+        read_only_fields = fields
+
+
+class LogEntryDetailSerializer(serializers.ModelSerializer):
+    """Serializer for a single log entry."""
+
     class Meta:
         model = LogEntry
-        fields = '__all__'
+        fields = [
+            'id', 'level', 'logger_name', 'message', 'module', 'function',
+            'line_number', 'created_at', 'updated_at'
+        ]
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ConfigurationSerializer(serializers.ModelSerializer):
-    """Serializer for configuration."""
-    
+class ConfigurationListSerializer(serializers.ModelSerializer):
+    """Serializer for configuration lists (omits the description)."""
+
+    class Meta:
+        model = Configuration
+        fields = ['id', 'key', 'value', 'is_active', 'updated_at']
+        read_only_fields = ['updated_at']
+
+
+class ConfigurationDetailSerializer(serializers.ModelSerializer):
+    """Serializer for a single configuration value."""
+
     class Meta:
         model = Configuration
-        fields = '__all__'
+        fields = ['id', 'key', 'value', 'description', 'is_active', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
@@ -4,10 +4,22 @@ import logging
 from datetime import datetime, time
 import pytz
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from .models import LogEntry, Configuration
 
 
+_last_market_state = None
+
+
+def _log_market_state(state, message):
+    """Log a market state message only when the open/closed state changes."""
+    global _last_market_state
+    if state != _last_market_state:
+        _last_market_state = state
+        logging.getLogger('trading_bot').info(message)
+
+
 class MarketService:
     """Service for market-related operations."""
     
@@ -16,28 +28,25 @@ class MarketService:
         self.market_start = time(*map(int, settings.MARKET_CONFIG['MARKET_START'].split(':')))
         self.market_end = time(*map(int, settings.MARKET_CONFIG['MARKET_END'].split(':')))
         self.trading_days = settings.MARKET_CONFIG['TRADING_DAYS']
+        self._trading_days_set = frozenset(self.trading_days)
     
     def is_market_open(self):
         """Check if NSE is currently open."""
-        logger = logging.getLogger('trading_bot')
-        current_time = datetime.now(self.timezone).time()
+        now = datetime.now(self.timezone)
         
         # Check if it's a weekday (0 = Monday, 6 = Sunday)
-        current_weekday = datetime.now(self.timezone).weekday()
-        is_weekday = current_weekday in self.trading_days
-        
-        # Check if current time is within market hours
-        is_within_hours = self.market_start <= current_time <= self.market_end
-        
-        if not is_weekday:
-            logger.info(f"Market closed: Non-trading day (weekday: {current_weekday})")
+        current_weekday = now.weekday()
+        if current_weekday not in self._trading_days_set:
+            _log_market_state('NON_TRADING_DAY', f"Market closed: Non-trading day (weekday: {current_weekday})")
             return False
         
-        if not is_within_hours:
-            logger.info(f"Market closed: Outside trading hours (Current IST: {current_time.strftime('%H:%M')})")
+        # Check if current time is within market hours
+        current_time = now.time()
+        if not self.market_start <= current_time <= self.market_end:
+            _log_market_state('OUTSIDE_HOURS', f"Market closed: Outside trading hours (Current IST: {current_time.strftime('%H:%M')})")
             return False
         
-        logger.info(f"Market open: Trading hours active (Current IST: {current_time.strftime('%H:%M')})")
+        _log_market_state('OPEN', f"Market open: Trading hours active (Current IST: {current_time.strftime('%H:%M')})")
         return True
     
     def get_market_status(self):
@@ -172,9 +181,47 @@ class LoggingService:
         return logger
 
 
+# Trading configuration keys and the parser applied to each stored value
+_TRADING_KEYS = {
+    'CHECK_INTERVAL': int,
+    'MAX_POSITIONS': int,
+    'FIXED_QTY': int,
+    'MAX_POSITION_SIZE': float,
+    'MAX_LOSS_PERCENT': float,
+    'PRICE_THRESHOLD': float,
+}
+
+
 class ConfigurationService:
     """Service for managing dynamic configuration."""
     
+    CONFIG_VERSION_KEY = 'config:ver'
+    # Version bumps only reach processes sharing the cache (LocMemCache is
+    # per process), so cached configs also expire after this many seconds
+    CONFIG_CACHE_TTL = 30
+    
+    @classmethod
+    def get_config_version(cls):
+        """Get the current configuration cache version."""
+        return cache.get(cls.CONFIG_VERSION_KEY, 0)
+    
+    @classmethod
+    def bump_config_version(cls):
+        """Invalidate cached configuration by moving to a new version."""
+        try:
+            cache.incr(cls.CONFIG_VERSION_KEY)
+        except ValueError:
+            cache.set(cls.CONFIG_VERSION_KEY, 1, None)
+    
+    @classmethod
+    def get_active_configs(cls):
+        """Get all active configuration values as a {key: value} dict, cached per version for a short TTL."""
+        return cache.get_or_set(
+            f'configs:{cls.get_config_version()}',
+            lambda: dict(Configuration.objects.filter(is_active=True).values_list('key', 'value')),
+            cls.CONFIG_CACHE_TTL
+        )
+    
     @classmethod
     def get_config(cls, key, default=None):
         """Get a configuration value."""
@@ -200,11 +247,8 @@ class ConfigurationService:
     @classmethod
     def get_trading_config(cls):
         """Get all trading-related configuration."""
+        rows = cls.get_active_configs()
         return {
-            'CHECK_INTERVAL': int(cls.get_config('CHECK_INTERVAL', settings.TRADING_CONFIG['CHECK_INTERVAL'])),
-            'MAX_POSITIONS': int(cls.get_config('MAX_POSITIONS', settings.TRADING_CONFIG['MAX_POSITIONS'])),
-            'FIXED_QTY': int(cls.get_config('FIXED_QTY', settings.TRADING_CONFIG['FIXED_QTY'])),
-            'MAX_POSITION_SIZE': float(cls.get_config('MAX_POSITION_SIZE', settings.TRADING_CONFIG['MAX_POSITION_SIZE'])),
-            'MAX_LOSS_PERCENT': float(cls.get_config('MAX_LOSS_PERCENT', settings.TRADING_CONFIG['MAX_LOSS_PERCENT'])),
-            'PRICE_THRESHOLD': float(cls.get_config('PRICE_THRESHOLD', settings.TRADING_CONFIG['PRICE_THRESHOLD'])),
+            key: parser(rows.get(key, settings.TRADING_CONFIG[key]))
+            for key, parser in _TRADING_KEYS.items()
         }
@@ -0,0 +1,13 @@
+"""Core signal handlers."""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Configuration
+from .services import ConfigurationService
+
+
+@receiver(post_save, sender=Configuration)
+@receiver(post_delete, sender=Configuration)
+def invalidate_configuration_cache(sender, **kwargs):
+    """Bump the configuration cache version whenever a row changes."""
+    ConfigurationService.bump_config_version()
@@ -11,5 +11,5 @@ router.register(r'config', views.ConfigurationViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('market-status/', views.MarketStatusView.as_view(), name='market-status'),
-    path('health/', views.HealthCheckView.as_view(), name='health-check'),
+    path('health/', views.health_check, name='health-check'),
 ]
@@ -4,11 +4,62 @@ Documentation maintenance script
 Helps keep FUNCTIONALITY_REFERENCE.md updated
 """
 
+import functools
 import os
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+_TODO_RE = re.compile(rb'TODO|FIXME', re.IGNORECASE)
+
+
+@functools.cache
+def _scan_project(base_dir):
+    """Collect apps, management commands and API modules in one directory pass
+
+    Results are cached per process; call _scan_project.cache_clear() to rescan.
+    """
+    apps, commands, api_files = [], [], []
+    
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            
+            with os.scandir(entry.path) as children:
+                names = {child.name for child in children}
+            
+            if "models.py" in names:
+                apps.append(entry.name)
+            if "views.py" in names or "urls.py" in names:
+                api_files.append(entry.name)
+            
+            if "management" in names:
+                cmd_dir = os.path.join(entry.path, "management", "commands")
+                try:
+                    with os.scandir(cmd_dir) as cmd_entries:
+                        for cmd_file in cmd_entries:
+                            if cmd_file.name.endswith(".py") and cmd_file.name != "__init__.py":
+                                commands.append(f"{entry.name}/{cmd_file.name[:-3]}")
+                except OSError:
+                    pass
+    
+    return tuple(apps), tuple(commands), tuple(api_files)
+
+
+@functools.cache
+def _count_doc_todos(docs_dir):
+    """Count TODO/FIXME markers across markdown files under docs_dir"""
+    todo_count = 0
+    for doc_file in Path(docs_dir).rglob("*.md"):
+        try:
+            with doc_file.open('rb') as f:
+                todo_count += sum(1 for _ in _TODO_RE.finditer(f.read()))
+        except OSError:
+            pass
+    return todo_count
+
 def update_functionality_reference():
     """Update the functionality reference with current project state"""
     
@@ -22,30 +73,8 @@ def update_functionality_reference():
     
     print("🔍 Analyzing current project structure...")
     
-    # Count Django apps
-    apps = []
-    for item in base_dir.iterdir():
-        if item.is_dir() and (item / "models.py").exists():
-            apps.append(item.name)
-    
-    # Count management commands
-    commands = []
-    for app_dir in base_dir.iterdir():
-        if app_dir.is_dir():
-            cmd_dir = app_dir / "management" / "commands"
-            if cmd_dir.exists():
-                for cmd_file in cmd_dir.iterdir():
-                    if cmd_file.suffix == ".py" and cmd_file.name != "__init__.py":
-                        commands.append(f"{app_dir.name}/{cmd_file.stem}")
-    
-    # Count API endpoints (approximate)
-    api_files = []
-    for app_dir in base_dir.iterdir():
-        if app_dir.is_dir():
-            views_file = app_dir / "views.py"
-            urls_file = app_dir / "urls.py"
-            if views_file.exists() or urls_file.exists():
-                api_files.append(app_dir.name)
+    # Count Django apps, management commands and API modules (approximate)
+    apps, commands, api_files = _scan_project(str(base_dir))
     
     # Generate update info
     update_info = f"""
@@ -108,15 +137,7 @@ def check_documentation_health():
             print(f"✅ FUNCTIONALITY_REFERENCE.md is up to date ({days_old} days old)")
     
     # Check for TODO or FIXME in docs
-    todo_count = 0
-    if docs_dir.exists():
-        for doc_file in docs_dir.rglob("*.md"):
-            try:
-                content = doc_file.read_text(encoding='utf-8')
-                todo_count += content.upper().count("TODO")
-                todo_count += content.upper().count("FIXME")
-            except:
-                pass
+    todo_count = _count_doc_todos(str(docs_dir)) if docs_dir.exists() else 0
     
     if todo_count > 0:
         print(f"📝 Found {todo_count} TODO/FIXME items in documentation")
@@ -8,20 +8,14 @@ def main():
     """Run administrative tasks."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'trading_platform.settings')
     
-    # Auto-configure ngrok for runserver
-    if len(sys.argv) >= 2 and sys.argv[1] == 'runserver':
-        # Set default environment variables if not set
-        if 'NGROK_AUTO_START' not in os.environ:
-            os.environ['NGROK_AUTO_START'] = 'True'
-        
-        if 'NGROK_AUTH_TOKEN' not in os.environ:
-            os.environ['NGROK_AUTH_TOKEN'] = '2zIambSj5KfyMpM6mcBWmkvDWtq_69e8qH2wuA4jGu7A5o6RL'
-        
-        if 'ANGEL_CLIENT_ID' not in os.environ:
-            os.environ['ANGEL_CLIENT_ID'] = 'xhMChjlS'
-        
-        if 'ANGEL_CLIENT_SECRET' not in os.environ:
-            os.environ['ANGEL_CLIENT_SECRET'] = '78e4798a-f35b-481f-9804-ff78557f99ed'
+    # Only the runserver parent loads .env; the autoreloader child
+    # (RUN_MAIN=true) inherits its environment
+    if len(sys.argv) >= 2 and sys.argv[1] == 'runserver' and os.environ.get('RUN_MAIN') != 'true':
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
+        except ImportError:
+            pass
     
     try:
         from django.core.management import execute_from_command_line
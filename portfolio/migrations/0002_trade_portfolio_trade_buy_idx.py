@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(condition=models.Q(('action', 'BUY')), fields=['portfolio'], name='portfolio_trade_buy_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-15 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_trade_portfolio_trade_buy_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['portfolio', '-created_at'], include=('profit', 'buy_amount', 'action'), name='portfolio_trade_pnl_cover_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-15 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_trade_portfolio_trade_pnl_cover_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='position',
+            name='portfolio_p_portfol_45c761_idx',
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['portfolio', 'is_open'], include=('symbol', 'current_price', 'stop_loss', 'target_price'), name='portfolio_pos_open_cover_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['portfolio', 'action'], name='portfolio_t_portfol_65a067_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tradingsession',
+            index=models.Index(fields=['portfolio', 'is_active', 'session_date'], name='portfolio_t_portfol_6bc862_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 """Portfolio management models."""
 
+from functools import cached_property
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -21,17 +22,17 @@ class Portfolio(TimeStampedModel):
     def __str__(self):
         return f"{self.user.username}'s {self.name} - ₹{self.current_balance}"
     
-    @property
+    @cached_property
     def total_pnl(self):
         """Calculate total profit/loss."""
-        return sum(trade.profit or 0 for trade in self.trades.all())
+        return self.trades.aggregate(total=models.Sum('profit'))['total'] or 0
     
-    @property
+    @cached_property
     def total_invested(self):
         """Calculate total amount invested."""
-        return sum(trade.buy_amount or 0 for trade in self.trades.filter(action='BUY'))
+        return self.trades.filter(action='BUY').aggregate(total=models.Sum('buy_amount'))['total'] or 0
     
-    @property
+    @cached_property
     def open_positions_count(self):
         """Count open positions."""
         return self.positions.filter(is_open=True).count()
@@ -83,19 +84,79 @@ class Trade(TimeStampedModel):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['portfolio', 'symbol', '-created_at']),
+            models.Index(fields=['portfolio', 'action']),
             models.Index(fields=['action', '-created_at']),
             models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['portfolio'], condition=models.Q(action='BUY'), name='portfolio_trade_buy_idx'),
+            models.Index(
+                fields=['portfolio', '-created_at'], include=['profit', 'buy_amount', 'action'],
+                name='portfolio_trade_pnl_cover_idx'
+            ),
         ]
     
     def __str__(self):
         return f"{self.action} {self.quantity} {self.symbol.symbol} @ ₹{self.price} - {self.status}"
     
-    def save(self, *args, **kwargs):
-        """Calculate derived fields before saving."""
+    def _set_derived_fields(self):
+        """Calculate fields derived from price, quantity and brokerage."""
         if self.action == 'BUY':
             self.buy_amount = self.price * self.quantity + self.brokerage_fee
-        
+    
+    def save(self, *args, **kwargs):
+        """Calculate derived fields before saving."""
+        self._set_derived_fields()
         super().save(*args, **kwargs)
+    
+    @classmethod
+    def bulk_execute(cls, trades, batch_size=1000):
+        """Insert unsaved trades in batches, filling the fields save() derives."""
+        trades = list(trades)
+        for trade in trades:
+            trade._set_derived_fields()
+        return cls.objects.bulk_create(trades, batch_size=batch_size)
+
+
+class PositionQuerySet(models.QuerySet):
+    """QuerySet for positions with bulk market-price updates."""
+    
+    def bulk_update_prices(self, price_by_symbol):
+        """Apply current prices to open positions in a single UPDATE.
+        
+        price_by_symbol maps NSESymbol ids to their latest price. Derived values
+        are computed from the new price directly, since F() reads pre-update columns.
+        The percentage uses a float factor so SQLite can't truncate it with
+        integer division when the stored amounts are integral.
+        """
+        if not price_by_symbol:
+            return 0
+        
+        money = models.DecimalField(max_digits=15, decimal_places=2)
+        price = models.Case(
+            *[
+                models.When(symbol_id=symbol_id, then=models.Value(new_price, output_field=money))
+                for symbol_id, new_price in price_by_symbol.items()
+            ],
+            output_field=money
+        )
+        current_value = models.ExpressionWrapper(price * models.F('total_quantity'), output_field=money)
+        unrealized_pnl = models.ExpressionWrapper(current_value - models.F('invested_amount'), output_field=money)
+        
+        return self.filter(is_open=True, symbol_id__in=price_by_symbol).update(
+            current_price=price,
+            current_value=current_value,
+            unrealized_pnl=unrealized_pnl,
+            unrealized_pnl_percent=models.Case(
+                models.When(
+                    invested_amount__gt=0,
+                    then=models.ExpressionWrapper(
+                        unrealized_pnl * models.Value(100.0) / models.F('invested_amount'), output_field=money
+                    )
+                ),
+                default=models.F('unrealized_pnl_percent'),
+                output_field=money
+            ),
+            updated_at=timezone.now()
+        )
 
 
 class Position(TimeStampedModel):
@@ -123,11 +184,16 @@ class Position(TimeStampedModel):
     stop_loss = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     target_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     
+    objects = PositionQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['portfolio', 'symbol']
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['portfolio', 'is_open']),
+            models.Index(
+                fields=['portfolio', 'is_open'], include=['symbol', 'current_price', 'stop_loss', 'target_price'],
+                name='portfolio_pos_open_cover_idx'
+            ),
             models.Index(fields=['symbol', 'is_open']),
         ]
     
@@ -143,13 +209,15 @@ class Position(TimeStampedModel):
         if self.invested_amount > 0:
             self.unrealized_pnl_percent = (self.unrealized_pnl / self.invested_amount) * 100
         
-        self.save()
+        self.save(update_fields=[
+            'current_price', 'current_value', 'unrealized_pnl', 'unrealized_pnl_percent', 'updated_at'
+        ])
     
     def close_position(self):
         """Mark position as closed."""
         self.is_open = False
         self.exit_date = timezone.now()
-        self.save()
+        self.save(update_fields=['is_open', 'exit_date', 'updated_at'])
 
 
 class TradingSession(TimeStampedModel):
@@ -179,6 +247,7 @@ class TradingSession(TimeStampedModel):
         ordering = ['-session_date', '-start_time']
         indexes = [
             models.Index(fields=['portfolio', 'session_date']),
+            models.Index(fields=['portfolio', 'is_active', 'session_date']),
             models.Index(fields=['is_active', '-session_date']),
         ]
     
@@ -191,7 +260,7 @@ class TradingSession(TimeStampedModel):
         self.end_time = timezone.now()
         self.ending_balance = self.portfolio.current_balance
         self.total_pnl = self.ending_balance - self.starting_balance
-        self.save()
+        self.save(update_fields=['is_active', 'end_time', 'ending_balance', 'total_pnl', 'updated_at'])
 
 
 class WatchList(TimeStampedModel):
@@ -206,6 +275,11 @@ class WatchList(TimeStampedModel):
     
     def __str__(self):
         return f"{self.name} - {self.portfolio.user.username}"
+    
+    @cached_property
+    def items_count(self):
+        """Count items in the watchlist."""
+        return self.items.count()
 
 
 class WatchListItem(TimeStampedModel):
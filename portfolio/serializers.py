@@ -1,8 +1,28 @@
 """Portfolio serializers."""
 
+import functools
+import time
 from rest_framework import serializers
+from angel_api.models import NSESymbol
 from .models import Portfolio, Trade, Position, TradingSession, WatchList, WatchListItem
 
+SYMBOL_MAP_TTL = 300  # seconds
+
+
+@functools.lru_cache(maxsize=1)
+def _nse_symbol_ids(bucket):
+    """Map NSE symbol names to ids, rebuilt once per SYMBOL_MAP_TTL bucket."""
+    return dict(NSESymbol.objects.filter(exchange='NSE').values_list('symbol', 'id'))
+
+
+def get_nse_symbol_id(symbol):
+    """Resolve an NSE symbol name to its id from the cached map."""
+    symbol_id = _nse_symbol_ids(int(time.monotonic() // SYMBOL_MAP_TTL)).get(symbol)
+    if symbol_id is None:
+        # Symbols added since the map was built are looked up directly
+        symbol_id = NSESymbol.objects.filter(symbol=symbol, exchange='NSE').values_list('id', flat=True).first()
+    return symbol_id
+
 
 class PortfolioSerializer(serializers.ModelSerializer):
     """Serializer for portfolio."""
@@ -52,7 +72,7 @@ class TradingSessionSerializer(serializers.ModelSerializer):
 class WatchListSerializer(serializers.ModelSerializer):
     """Serializer for watchlists."""
     portfolio_user = serializers.CharField(source='portfolio.user.username', read_only=True)
-    items_count = serializers.IntegerField(source='items.count', read_only=True)
+    items_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = WatchList
@@ -79,3 +99,11 @@ class ExecuteTradeSerializer(serializers.Serializer):
     action = serializers.ChoiceField(choices=['BUY', 'SELL'])
     order_type = serializers.ChoiceField(choices=['MARKET', 'LIMIT'], default='MARKET')
     remarks = serializers.CharField(max_length=500, required=False, allow_blank=True)
+    
+    def validate(self, attrs):
+        """Resolve the symbol name to an NSESymbol id."""
+        symbol_id = get_nse_symbol_id(attrs['symbol'])
+        if symbol_id is None:
+            raise serializers.ValidationError({'symbol': f"Unknown NSE symbol: {attrs['symbol']}"})
+        attrs['symbol_id'] = symbol_id
+        return attrs
@@ -2,21 +2,51 @@
 
 import logging
 from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from functools import cached_property
+from django.core.cache import cache
 from django.utils import timezone
 from django.db import transaction
-from django.db.models import Sum, Avg, Q
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum, Avg, Count, Q, Value
+from django.db.models.functions import Coalesce
 from .models import Portfolio, Trade, Position, TradingSession, WatchList, WatchListItem
 from angel_api.models import NSESymbol
-from angel_api.services import AngelOneAPI
+from angel_api.services import get_client
+
+
+_symbol_ids = None
+
+
+def _get_symbol_id(symbol_name):
+    """Get or create an NSE symbol and return its id, memoized per process.
+    
+    The whole NSE symbol map is loaded in one query on first use, so only
+    symbols unknown at that point cost a get_or_create.
+    """
+    global _symbol_ids
+    if _symbol_ids is None:
+        _symbol_ids = dict(NSESymbol.objects.filter(exchange='NSE').values_list('symbol', 'id'))
+    
+    symbol_id = _symbol_ids.get(symbol_name)
+    if symbol_id is None:
+        symbol, created = NSESymbol.objects.get_or_create(
+            symbol=symbol_name,
+            exchange='NSE',
+            defaults={'token': symbol_name, 'lot_size': 1}
+        )
+        symbol_id = _symbol_ids[symbol_name] = symbol.id
+    return symbol_id
 
 
 class PortfolioService:
     """Service for portfolio management operations."""
     
+    SUMMARY_CACHE_TIMEOUT = 60  # seconds
+    
     def __init__(self, portfolio=None):
         self.portfolio = portfolio
         self.logger = logging.getLogger('portfolio')
-        self.angel_api = AngelOneAPI()
+        self.angel_api = get_client()
     
     def get_or_create_portfolio(self, user):
         """Get or create portfolio for user."""
@@ -35,26 +65,37 @@ class PortfolioService:
         """Update portfolio balance."""
         if self.portfolio:
             self.portfolio.current_balance = new_balance
-            self.portfolio.save()
+            self.portfolio.save(update_fields=['current_balance', 'updated_at'])
             self.logger.info(f"Portfolio balance updated to ₹{new_balance}")
     
     def get_balance(self):
         """Get current portfolio balance."""
         return float(self.portfolio.current_balance) if self.portfolio else 0.0
     
-    def execute_trade(self, symbol_name, price, quantity, action, order_type='MARKET', remarks=''):
+    def get_total_value(self, portfolio=None):
+        """Get cash balance plus the market value of open positions."""
+        portfolio = portfolio or self.portfolio
+        if not portfolio:
+            return Decimal(0)
+        
+        holdings = Position.objects.filter(portfolio=portfolio, is_open=True).aggregate(
+            total=Sum(Coalesce('current_value', 'invested_amount'))
+        )['total'] or 0
+        return portfolio.current_balance + holdings
+    
+    def execute_trade(self, symbol_name, price, quantity, action, order_type='MARKET', remarks='', symbol_id=None):
         """Execute a trade and update portfolio."""
         if not self.portfolio:
             raise ValueError("Portfolio not set")
         
         try:
+            # Resolve the symbol outside the trade transaction so a rollback
+            # can't leave a memoized id pointing at a discarded row
+            if symbol_id is None:
+                symbol_id = _get_symbol_id(symbol_name)
+            symbol = NSESymbol(id=symbol_id, symbol=symbol_name, exchange='NSE')
+            
             with transaction.atomic():
-                # Get or create symbol
-                symbol, created = NSESymbol.objects.get_or_create(
-                    symbol=symbol_name,
-                    exchange='NSE',
-                    defaults={'token': symbol_name, 'lot_size': 1}
-                )
                 
                 # Calculate trade amount
                 trade_amount = price * quantity
@@ -78,6 +119,10 @@ class PortfolioService:
                 elif action == 'SELL':
                     self._execute_sell_trade(trade, symbol, price, quantity, trade_amount, brokerage_fee)
                 
+                # Queryset updates above bypass post_save, so invalidate explicitly
+                portfolio_id = self.portfolio.pk
+                transaction.on_commit(lambda: self.bump_summary_version(portfolio_id))
+                
                 self.logger.info(f"Trade executed: {action} {quantity} {symbol_name} @ ₹{price}")
                 return trade
                 
@@ -87,11 +132,10 @@ class PortfolioService:
     
     def _execute_buy_trade(self, trade, symbol, price, quantity, trade_amount, brokerage_fee):
         """Execute buy trade logic."""
-        total_cost = trade_amount + brokerage_fee
+        total_cost = Decimal(str(trade_amount + brokerage_fee))
         
-        # Update portfolio balance
-        self.portfolio.current_balance -= total_cost
-        self.portfolio.save()
+        # Update portfolio balance in place so concurrent trades can't clobber it
+        self._adjust_balance(-total_cost)
         
         # Update or create position
         position, created = Position.objects.get_or_create(
@@ -106,21 +150,27 @@ class PortfolioService:
         )
         
         if not created:
+            # Lock the row and average in Decimal; dividing F() expressions
+            # truncates to an integer on SQLite when the stored values are integral
+            position = Position.objects.select_for_update().get(pk=position.pk)
+            average_price = (
+                (position.invested_amount + total_cost) / (position.total_quantity + quantity)
+            ).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            
             # Update existing position
-            total_invested = position.invested_amount + total_cost
-            total_quantity = position.total_quantity + quantity
-            position.average_price = total_invested / total_quantity
-            position.total_quantity = total_quantity
-            position.invested_amount = total_invested
-            position.save()
+            Position.objects.filter(pk=position.pk).update(
+                total_quantity=F('total_quantity') + quantity,
+                invested_amount=F('invested_amount') + total_cost,
+                average_price=average_price,
+                updated_at=timezone.now()
+            )
     
     def _execute_sell_trade(self, trade, symbol, price, quantity, trade_amount, brokerage_fee):
         """Execute sell trade logic."""
-        net_amount = trade_amount - brokerage_fee
+        net_amount = Decimal(str(trade_amount - brokerage_fee))
         
-        # Update portfolio balance
-        self.portfolio.current_balance += net_amount
-        self.portfolio.save()
+        # Update portfolio balance in place so concurrent trades can't clobber it
+        self._adjust_balance(net_amount)
         
         # Update position
         try:
@@ -135,15 +185,20 @@ class PortfolioService:
                 # Update trade with profit info
                 trade.profit = profit
                 trade.pnl_percent = profit_percent
-                trade.save()
+                trade.save(update_fields=['profit', 'pnl_percent', 'updated_at'])
                 
-                # Update position
-                position.total_quantity -= quantity
+                # Update position, guarding against a concurrent sell draining it first
+                updated = Position.objects.filter(pk=position.pk, total_quantity__gte=quantity).update(
+                    total_quantity=F('total_quantity') - quantity,
+                    invested_amount=F('invested_amount') - avg_buy_price * quantity,
+                    updated_at=timezone.now()
+                )
+                if not updated:
+                    raise ValueError(f"Insufficient quantity in position. Requested: {quantity}")
+                
+                position.refresh_from_db(fields=['total_quantity', 'invested_amount'])
                 if position.total_quantity == 0:
                     position.close_position()
-                else:
-                    position.invested_amount -= avg_buy_price * quantity
-                    position.save()
                 
                 self.logger.info(f"Sell trade profit: ₹{profit:.2f} ({profit_percent:.2f}%)")
             else:
@@ -152,6 +207,14 @@ class PortfolioService:
         except Position.DoesNotExist:
             raise ValueError("No open position found for this symbol")
     
+    def _adjust_balance(self, delta):
+        """Apply a balance delta with a single UPDATE and refresh the cached value."""
+        Portfolio.objects.filter(pk=self.portfolio.pk).update(
+            current_balance=F('current_balance') + delta,
+            updated_at=timezone.now()
+        )
+        self.portfolio.refresh_from_db(fields=['current_balance'])
+    
     def get_open_positions(self):
         """Get all open positions."""
         if not self.portfolio:
@@ -166,34 +229,62 @@ class PortfolioService:
         
         return Trade.objects.filter(portfolio=self.portfolio).order_by('-created_at')[:limit]
     
+    @staticmethod
+    def _summary_version_key(portfolio_id):
+        """Cache key holding a portfolio's summary version."""
+        return f'psum:ver:{portfolio_id}'
+    
+    @classmethod
+    def bump_summary_version(cls, portfolio_id):
+        """Invalidate a portfolio's cached summary by moving to a new version."""
+        key = cls._summary_version_key(portfolio_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+    
     def get_portfolio_summary(self):
-        """Get portfolio summary with statistics."""
+        """Get portfolio summary with statistics, cached until the portfolio changes."""
         if not self.portfolio:
             return {}
         
-        trades = self.get_trades()
-        open_positions = self.get_open_positions()
-        
-        # Calculate statistics
-        total_trades = trades.count()
-        buy_trades = trades.filter(action='BUY').count()
-        sell_trades = trades.filter(action='SELL').count()
+        version = cache.get(self._summary_version_key(self.portfolio.id), 0)
+        return cache.get_or_set(
+            f'psum:{self.portfolio.id}:{version}',
+            self._compute_portfolio_summary,
+            self.SUMMARY_CACHE_TIMEOUT
+        )
+    
+    def _compute_portfolio_summary(self):
+        """Compute portfolio summary statistics from the database in one query."""
+        # Trade stats aggregate over the trades join; open positions come from a
+        # correlated subquery so they don't multiply the joined trade rows.
+        open_positions = Position.objects.filter(
+            portfolio=OuterRef('pk'), is_open=True
+        ).order_by().values('portfolio').annotate(count=Count('id')).values('count')
         
-        total_invested = trades.filter(action='BUY').aggregate(
-            total=Sum('buy_amount')
-        )['total'] or 0
+        stats = Portfolio.objects.filter(pk=self.portfolio.pk).values('pk').annotate(
+            total_trades=Count('trades'),
+            buy_trades=Count('trades', filter=Q(trades__action='BUY')),
+            sell_trades=Count('trades', filter=Q(trades__action='SELL')),
+            total_invested=Sum('trades__buy_amount', filter=Q(trades__action='BUY')),
+            total_profit=Sum('trades__profit', filter=Q(trades__action='SELL')),
+            open_positions=Coalesce(Subquery(open_positions, output_field=IntegerField()), Value(0)),
+        ).values(
+            'current_balance', 'initial_balance', 'total_trades', 'buy_trades', 'sell_trades',
+            'total_invested', 'total_profit', 'open_positions'
+        ).get()
         
-        total_profit = trades.filter(action='SELL').aggregate(
-            total=Sum('profit')
-        )['total'] or 0
+        total_invested = stats['total_invested'] or 0
+        total_profit = stats['total_profit'] or 0
         
         return {
-            'current_balance': float(self.portfolio.current_balance),
-            'initial_balance': float(self.portfolio.initial_balance),
-            'total_trades': total_trades,
-            'buy_trades': buy_trades,
-            'sell_trades': sell_trades,
-            'open_positions': open_positions.count(),
+            'current_balance': float(stats['current_balance']),
+            'initial_balance': float(stats['initial_balance']),
+            'total_trades': stats['total_trades'],
+            'buy_trades': stats['buy_trades'],
+            'sell_trades': stats['sell_trades'],
+            'open_positions': stats['open_positions'],
             'total_invested': float(total_invested),
             'total_profit': float(total_profit),
             'profit_percentage': (total_profit / total_invested * 100) if total_invested > 0 else 0,
@@ -201,46 +292,197 @@ class PortfolioService:
     
     def update_positions_with_current_prices(self):
         """Update all open positions with current market prices."""
-        open_positions = self.get_open_positions()
+        open_positions = Position.objects.filter(portfolio=self.portfolio, is_open=True)
+        symbols = [position.symbol for position in open_positions.select_related('symbol')]
+        if not symbols:
+            return
         
-        for position in open_positions:
-            try:
-                current_price = self.angel_api.get_ltp(position.symbol.symbol)
-                position.update_current_price(current_price)
-                self.logger.info(f"Updated {position.symbol.symbol} price to ₹{current_price}")
-            except Exception as e:
-                self.logger.error(f"Error updating price for {position.symbol.symbol}: {e}")
+        # One market-data request and one UPDATE for the whole book
+        prices = self.angel_api.get_ltp_bulk(symbols)
+        price_by_symbol_id = {
+            symbol.id: Decimal(str(prices[symbol.symbol])) for symbol in symbols if symbol.symbol in prices
+        }
+        
+        with transaction.atomic():
+            updated = open_positions.bulk_update_prices(price_by_symbol_id)
+        
+        missing = [symbol.symbol for symbol in symbols if symbol.symbol not in prices]
+        if missing:
+            self.logger.error(f"No price available for {', '.join(missing)}")
+        self.logger.info(f"Updated prices for {updated} open positions")
     
     def check_stop_loss_targets(self):
         """Check stop loss and target prices for open positions."""
-        open_positions = self.get_open_positions()
-        alerts = []
+        # Let the database pick out the triggered positions; comparisons against
+        # a NULL price or level never match, so untracked positions drop out.
+        open_positions = Position.objects.filter(portfolio=self.portfolio, is_open=True)
+        stop_hits = open_positions.filter(current_price__lte=F('stop_loss')).values_list(
+            'symbol__symbol', 'current_price', 'stop_loss'
+        )
+        target_hits = open_positions.filter(current_price__gte=F('target_price')).values_list(
+            'symbol__symbol', 'current_price', 'target_price'
+        )
+        
+        alerts = [
+            {
+                'type': 'STOP_LOSS',
+                'symbol': symbol,
+                'current_price': float(current_price),
+                'trigger_price': float(stop_loss),
+                'message': f"Stop loss triggered for {symbol}"
+            }
+            for symbol, current_price, stop_loss in stop_hits
+        ]
+        alerts.extend(
+            {
+                'type': 'TARGET',
+                'symbol': symbol,
+                'current_price': float(current_price),
+                'trigger_price': float(target_price),
+                'message': f"Target price reached for {symbol}"
+            }
+            for symbol, current_price, target_price in target_hits
+        )
         
-        for position in open_positions:
-            if not position.current_price:
-                continue
+        return alerts
+
+
+class BulkPortfolioService(PortfolioService):
+    """Portfolio service that buffers trades in memory and writes them in batches.
+    
+    Meant for backtest/replay loops: execute_trade_deferred() applies each trade
+    to in-memory positions, and flush() persists everything with bulk queries.
+    """
+    
+    FLUSH_BATCH_SIZE = 5000
+    BROKERAGE_RATE = Decimal('0.0003')  # 0.03% brokerage
+    
+    def __init__(self, portfolio=None):
+        super().__init__(portfolio)
+        self._pending_trades = []
+        self._positions = None
+        self._dirty_positions = {}
+        self._balance_delta = Decimal(0)
+    
+    def get_balance(self):
+        """Get current portfolio balance, including trades not yet flushed."""
+        if not self.portfolio:
+            return 0.0
+        return float(self.portfolio.current_balance + self._balance_delta)
+    
+    def _get_positions(self):
+        """Load the portfolio's positions keyed by symbol id, once per service."""
+        if self._positions is None:
+            self._positions = {
+                position.symbol_id: position
+                for position in Position.objects.filter(portfolio=self.portfolio)
+            }
+        return self._positions
+    
+    def execute_trade_deferred(self, symbol_name, price, quantity, action, order_type='MARKET', remarks='', symbol_id=None):
+        """Apply a trade in memory; it is written on the next flush()."""
+        if not self.portfolio:
+            raise ValueError("Portfolio not set")
+        
+        if symbol_id is None:
+            symbol_id = _get_symbol_id(symbol_name)
+        
+        price = Decimal(str(price))
+        trade_amount = price * quantity
+        brokerage_fee = trade_amount * self.BROKERAGE_RATE
+        
+        trade = Trade(
+            portfolio=self.portfolio,
+            symbol_id=symbol_id,
+            price=price,
+            quantity=quantity,
+            action=action,
+            order_type=order_type,
+            brokerage_fee=brokerage_fee,
+            remarks=remarks
+        )
+        
+        positions = self._get_positions()
+        position = positions.get(symbol_id)
+        
+        if action == 'BUY':
+            total_cost = trade_amount + brokerage_fee
+            self._balance_delta -= total_cost
+            if position is None:
+                position = Position(
+                    portfolio=self.portfolio,
+                    symbol_id=symbol_id,
+                    total_quantity=quantity,
+                    average_price=price,
+                    invested_amount=total_cost,
+                    is_open=True
+                )
+                positions[symbol_id] = position
+            else:
+                position.invested_amount += total_cost
+                position.total_quantity += quantity
+                position.average_price = position.invested_amount / position.total_quantity
+        elif action == 'SELL':
+            if position is None or not position.is_open:
+                raise ValueError("No open position found for this symbol")
+            if position.total_quantity < quantity:
+                raise ValueError(f"Insufficient quantity in position. Available: {position.total_quantity}, Requested: {quantity}")
             
-            # Check stop loss
-            if position.stop_loss and position.current_price <= position.stop_loss:
-                alerts.append({
-                    'type': 'STOP_LOSS',
-                    'symbol': position.symbol.symbol,
-                    'current_price': float(position.current_price),
-                    'trigger_price': float(position.stop_loss),
-                    'message': f"Stop loss triggered for {position.symbol.symbol}"
-                })
+            avg_buy_price = position.average_price
+            trade.profit = (price - avg_buy_price) * quantity - brokerage_fee
+            trade.pnl_percent = (trade.profit / (avg_buy_price * quantity)) * 100
             
-            # Check target price
-            if position.target_price and position.current_price >= position.target_price:
-                alerts.append({
-                    'type': 'TARGET',
-                    'symbol': position.symbol.symbol,
-                    'current_price': float(position.current_price),
-                    'trigger_price': float(position.target_price),
-                    'message': f"Target price reached for {position.symbol.symbol}"
-                })
+            self._balance_delta += trade_amount - brokerage_fee
+            position.total_quantity -= quantity
+            if position.total_quantity == 0:
+                position.is_open = False
+                position.exit_date = timezone.now()
+            else:
+                position.invested_amount -= avg_buy_price * quantity
         
-        return alerts
+        self._dirty_positions[symbol_id] = position
+        self._pending_trades.append(trade)
+        
+        if len(self._pending_trades) >= self.FLUSH_BATCH_SIZE:
+            self.flush()
+        return trade
+    
+    def execute_trade_batch(self, trades):
+        """Defer a sequence of trades given as execute_trade_deferred() kwargs, then flush."""
+        for trade in trades:
+            self.execute_trade_deferred(**trade)
+        return self.flush()
+    
+    def flush(self):
+        """Write buffered trades, position changes and the balance delta."""
+        if not self._pending_trades:
+            return 0
+        
+        now = timezone.now()
+        new_positions, changed_positions = [], []
+        for position in self._dirty_positions.values():
+            position.updated_at = now
+            (changed_positions if position.pk else new_positions).append(position)
+        
+        with transaction.atomic():
+            Position.objects.bulk_create(new_positions, batch_size=self.FLUSH_BATCH_SIZE)
+            Position.objects.bulk_update(
+                changed_positions,
+                ['total_quantity', 'average_price', 'invested_amount', 'is_open', 'exit_date', 'updated_at'],
+                batch_size=self.FLUSH_BATCH_SIZE
+            )
+            Trade.bulk_execute(self._pending_trades, batch_size=self.FLUSH_BATCH_SIZE)
+            self._adjust_balance(self._balance_delta)
+            
+            portfolio_id = self.portfolio.pk
+            transaction.on_commit(lambda: self.bump_summary_version(portfolio_id))
+        
+        flushed = len(self._pending_trades)
+        self._pending_trades = []
+        self._dirty_positions = {}
+        self._balance_delta = Decimal(0)
+        self.logger.info(f"Flushed {flushed} deferred trades, balance ₹{self.portfolio.current_balance}")
+        return flushed
 
 
 class TradingSessionService:
@@ -261,6 +503,7 @@ class TradingSessionService:
             is_active=True
         )
         
+        self.__dict__['active_session'] = session
         self.logger.info(f"Trading session started with balance ₹{session.starting_balance}")
         return session
     
@@ -274,33 +517,42 @@ class TradingSessionService:
         for session in active_sessions:
             session.end_session()
             self.logger.info(f"Ended trading session from {session.session_date}")
+        self.__dict__['active_session'] = None
     
-    def get_active_session(self):
-        """Get the active trading session."""
+    @cached_property
+    def active_session(self):
+        """The active trading session, looked up once per service instance."""
         return TradingSession.objects.filter(
             portfolio=self.portfolio,
             is_active=True
         ).first()
     
+    def get_active_session(self):
+        """Get the active trading session."""
+        return self.active_session
+    
     def get_session_statistics(self, days=30):
         """Get trading session statistics for the last N days."""
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=days)
         
-        sessions = TradingSession.objects.filter(
+        stats = TradingSession.objects.filter(
             portfolio=self.portfolio,
-            session_date__gte=start_date,
-            session_date__lte=end_date
+            session_date__range=(start_date, end_date)
+        ).aggregate(
+            total=Count('id'),
+            profitable=Count('id', filter=Q(total_pnl__gt=0)),
+            pnl_total=Sum('total_pnl'),
+            pnl_avg=Avg('total_pnl'),
         )
         
-        if not sessions.exists():
+        total_sessions = stats['total']
+        if not total_sessions:
             return {}
         
-        total_sessions = sessions.count()
-        profitable_sessions = sessions.filter(total_pnl__gt=0).count()
-        
-        total_pnl = sessions.aggregate(total=Sum('total_pnl'))['total'] or 0
-        avg_pnl = sessions.aggregate(avg=Avg('total_pnl'))['avg'] or 0
+        profitable_sessions = stats['profitable']
+        total_pnl = stats['pnl_total'] or 0
+        avg_pnl = stats['pnl_avg'] or 0
         
         return {
             'total_sessions': total_sessions,
@@ -335,15 +587,10 @@ class WatchListService:
         """Add a symbol to watchlist."""
         try:
             watchlist = WatchList.objects.get(id=watchlist_id, portfolio=self.portfolio)
-            symbol, created = NSESymbol.objects.get_or_create(
-                symbol=symbol_name,
-                exchange='NSE',
-                defaults={'token': symbol_name, 'lot_size': 1}
-            )
             
             item, created = WatchListItem.objects.get_or_create(
                 watchlist=watchlist,
-                symbol=symbol,
+                symbol_id=_get_symbol_id(symbol_name),
                 defaults={
                     'target_price': target_price,
                     'notes': notes,
@@ -372,19 +619,22 @@ class WatchListService:
     def check_watchlist_alerts(self):
         """Check for price alerts in all watchlists."""
         alerts = []
-        angel_api = AngelOneAPI()
+        angel_api = get_client()
         
-        active_items = WatchListItem.objects.filter(
+        active_items = list(WatchListItem.objects.select_related('symbol', 'watchlist').filter(
             watchlist__portfolio=self.portfolio,
             watchlist__is_active=True,
             is_active=True,
             target_price__isnull=False
-        )
+        ))
+        
+        # One market-data request for every distinct watched symbol
+        prices = angel_api.get_ltp_bulk({item.symbol_id: item.symbol for item in active_items}.values())
         
         for item in active_items:
             try:
-                current_price = angel_api.get_ltp(item.symbol.symbol)
-                if current_price <= item.target_price:
+                current_price = prices.get(item.symbol.symbol)
+                if current_price is not None and current_price <= item.target_price:
                     alerts.append({
                         'symbol': item.symbol.symbol,
                         'current_price': current_price,
@@ -0,0 +1,22 @@
+"""Portfolio signal handlers."""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Portfolio, Trade, Position
+from .services import PortfolioService
+
+
+@receiver(post_save, sender=Portfolio)
+@receiver(post_delete, sender=Portfolio)
+def invalidate_portfolio_summary(sender, instance, **kwargs):
+    """Bump the summary cache version when the portfolio row changes."""
+    PortfolioService.bump_summary_version(instance.pk)
+
+
+@receiver(post_save, sender=Trade)
+@receiver(post_delete, sender=Trade)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+def invalidate_portfolio_summary_for_child(sender, instance, **kwargs):
+    """Bump the summary cache version when a trade or position changes."""
+    PortfolioService.bump_summary_version(instance.portfolio_id)
@@ -0,0 +1,31 @@
+"""Portfolio background tasks."""
+
+import logging
+from celery import shared_task
+from .models import Portfolio
+from .services import PortfolioService
+
+logger = logging.getLogger('portfolio')
+
+
+@shared_task(ignore_result=True)
+def refresh_position_prices(portfolio_id):
+    """Refresh current prices of a portfolio's open positions."""
+    try:
+        portfolio = Portfolio.objects.get(id=portfolio_id)
+    except Portfolio.DoesNotExist:
+        logger.warning(f"Skipping price refresh for missing portfolio {portfolio_id}")
+        return
+    
+    PortfolioService(portfolio).update_positions_with_current_prices()
+
+
+@shared_task(ignore_result=True)
+def refresh_all_position_prices():
+    """Queue a price refresh for every active portfolio holding open positions."""
+    portfolio_ids = Portfolio.objects.filter(
+        is_active=True, positions__is_open=True
+    ).values_list('id', flat=True).distinct()
+    
+    for portfolio_id in portfolio_ids:
+        refresh_position_prices.delay(portfolio_id)
@@ -0,0 +1,66 @@
+"""Portfolio tests."""
+
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.test import TestCase
+from angel_api.models import NSESymbol
+from .models import Portfolio, Position
+from .services import PortfolioService
+
+
+class BuyAveragePriceTests(TestCase):
+    """Average price of a position built up from several buys."""
+    
+    def setUp(self):
+        user = User.objects.create(username='trader')
+        self.portfolio = Portfolio.objects.create(user=user)
+        self.symbol = NSESymbol.objects.create(symbol='RELIANCE', token='2885', exchange='NSE')
+        self.service = PortfolioService(self.portfolio)
+    
+    def _buy(self, price, quantity):
+        self.service.execute_trade('RELIANCE', price, quantity, 'BUY', symbol_id=self.symbol.id)
+    
+    def test_average_includes_brokerage_across_buys(self):
+        for _ in range(3):
+            self._buy(100.0, 100)
+        
+        position = Position.objects.get(portfolio=self.portfolio, symbol=self.symbol)
+        self.assertEqual(position.total_quantity, 300)
+        self.assertEqual(position.invested_amount, Decimal('30009.00'))
+        self.assertEqual(position.average_price, Decimal('100.03'))
+    
+    def test_average_is_not_truncated_for_integral_values(self):
+        Position.objects.create(
+            portfolio=self.portfolio, symbol=self.symbol,
+            total_quantity=200, average_price=Decimal('50'), invested_amount=Decimal('10000')
+        )
+        
+        self._buy(100.0, 100)
+        
+        position = Position.objects.get(portfolio=self.portfolio, symbol=self.symbol)
+        self.assertEqual(position.average_price, Decimal('66.68'))
+
+
+class BulkPriceUpdateTests(TestCase):
+    """Queryset price updates agree with Position.update_current_price."""
+    
+    def test_percent_matches_instance_update_for_integral_values(self):
+        portfolio = Portfolio.objects.create(user=User.objects.create(username='trader'))
+        bulk_symbol = NSESymbol.objects.create(symbol='INFY', token='1594', exchange='NSE')
+        single_symbol = NSESymbol.objects.create(symbol='TCS', token='11536', exchange='NSE')
+        bulk = Position.objects.create(
+            portfolio=portfolio, symbol=bulk_symbol,
+            total_quantity=3, average_price=Decimal('100'), invested_amount=Decimal('301')
+        )
+        single = Position.objects.create(
+            portfolio=portfolio, symbol=single_symbol,
+            total_quantity=3, average_price=Decimal('100'), invested_amount=Decimal('301')
+        )
+        
+        Position.objects.filter(pk=bulk.pk).bulk_update_prices({bulk_symbol.id: Decimal('107')})
+        single.update_current_price(Decimal('107'))
+        
+        bulk.refresh_from_db()
+        single.refresh_from_db()
+        self.assertEqual(bulk.unrealized_pnl_percent, Decimal('6.64'))
+        self.assertEqual(bulk.unrealized_pnl_percent, single.unrealized_pnl_percent)
@@ -5,6 +5,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from .models import Portfolio, Trade, Position, TradingSession, WatchList, WatchListItem
 from .services import PortfolioService, TradingSessionService, WatchListService
@@ -22,8 +24,28 @@ class PortfolioViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        """Filter portfolios by user."""
-        return self.queryset.filter(user=self.request.user)
+        """Filter portfolios by user and annotate the serializer's aggregate fields."""
+        # Annotations share the Portfolio cached_property names, so annotated
+        # instances skip the per-row aggregate queries. Subqueries keep the
+        # trade and position aggregates from multiplying each other's rows.
+        trades = Trade.objects.filter(portfolio=OuterRef('pk')).order_by().values('portfolio')
+        open_positions = Position.objects.filter(portfolio=OuterRef('pk'), is_open=True).order_by().values('portfolio')
+        money = DecimalField(max_digits=15, decimal_places=2)
+        
+        return self.queryset.filter(user=self.request.user).select_related('user').annotate(
+            total_pnl=Coalesce(
+                Subquery(trades.annotate(total=Sum('profit')).values('total'), output_field=money),
+                Value(0), output_field=money
+            ),
+            total_invested=Coalesce(
+                Subquery(trades.filter(action='BUY').annotate(total=Sum('buy_amount')).values('total'), output_field=money),
+                Value(0), output_field=money
+            ),
+            open_positions_count=Coalesce(
+                Subquery(open_positions.annotate(count=Count('id')).values('count'), output_field=IntegerField()),
+                Value(0)
+            ),
+        )
     
     @action(detail=True, methods=['post'])
     def execute_trade(self, request, pk=None):
@@ -36,6 +58,7 @@ class PortfolioViewSet(viewsets.ModelViewSet):
                 portfolio_service = PortfolioService(portfolio)
                 trade = portfolio_service.execute_trade(
                     symbol_name=serializer.validated_data['symbol'],
+                    symbol_id=serializer.validated_data['symbol_id'],
                     price=serializer.validated_data['price'],
                     quantity=serializer.validated_data['quantity'],
                     action=serializer.validated_data['action'],
@@ -68,7 +91,7 @@ class TradeViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         """Filter trades by user's portfolios."""
-        return self.queryset.filter(portfolio__user=self.request.user)
+        return self.queryset.filter(portfolio__user=self.request.user).select_related('symbol', 'portfolio__user')
 
 
 class PositionViewSet(viewsets.ReadOnlyModelViewSet):
@@ -81,7 +104,7 @@ class PositionViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         """Filter positions by user's portfolios."""
-        return self.queryset.filter(portfolio__user=self.request.user)
+        return self.queryset.filter(portfolio__user=self.request.user).select_related('symbol', 'portfolio__user')
 
 
 class TradingSessionViewSet(viewsets.ModelViewSet):
@@ -94,7 +117,7 @@ class TradingSessionViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter sessions by user's portfolios."""
-        return self.queryset.filter(portfolio__user=self.request.user)
+        return self.queryset.filter(portfolio__user=self.request.user).select_related('portfolio__user')
 
 
 class WatchListViewSet(viewsets.ModelViewSet):
@@ -106,7 +129,13 @@ class WatchListViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter watchlists by user's portfolios."""
-        return self.queryset.filter(portfolio__user=self.request.user)
+        # items is a reverse FK: select_related can't follow it. If the
+        # serializer ever nests items, add prefetch_related(Prefetch('items',
+        # queryset=WatchListItem.objects.select_related('symbol').filter(is_active=True))).
+        # Until then only the annotated count is needed.
+        return self.queryset.filter(portfolio__user=self.request.user).select_related(
+            'portfolio__user'
+        ).annotate(items_count=Count('items')).order_by('name')
 
 
 class PortfolioSummaryView(APIView):
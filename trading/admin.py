@@ -43,5 +43,3 @@ class NewsAnalysisAdmin(admin.ModelAdmin):
     list_display = ['symbol', 'sentiment', 'published_at']
     list_filter = ['sentiment']
     search_fields = ['symbol__symbol', 'headline']
-
-print("✅ Trading admin loaded successfully!")
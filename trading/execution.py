@@ -8,30 +8,116 @@ Integrates with Angel One API for real trading and includes paper trading simula
 
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime, timedelta
 from django.utils import timezone
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Count
 from django.conf import settings
 
 from .models import TradingExecution, TradingSignal, TradingBot
 # from .transaction_models import TransactionRecord, PositionSummary, DailyTradingSummary
-from angel_api.services import AngelOneAPI
-from angel_api.models import Order, NSESymbol
-from portfolio.services import PortfolioService
-
 
+ONE = Decimal('1')
+HUNDRED = Decimal('100')
+ONE_CENT = Decimal('0.01')
 
 
 class TradingExecutor:
     """Main trading execution engine."""
     
+    # Paper-trade slippage as a ratio of integers: 0.1% against the trade
+    SLIPPAGE_NUM, SLIPPAGE_DEN = 1001, 1000
+    
     def __init__(self):
+        # Service imports are deferred so importing this module stays cheap
+        from angel_api.services import get_client
+        from portfolio.services import PortfolioService
+        
         self.logger = logging.getLogger('trading_execution')
-        self.angel_api = AngelOneAPI()
+        self.angel_api = get_client()
         self.portfolio_service = PortfolioService()
         
-    def execute_signal(self, signal: TradingSignal, bot: TradingBot, quantity=None):
+    def execute_signals_batch(self, signals, bot: TradingBot, quantities=None):
+        """
+        Execute several signals for one bot, pricing them with one bulk quote call.
+        
+        Args:
+            signals: TradingSignal instances (symbol should be select_related)
+            bot: TradingBot instance
+            quantities: Override quantities keyed by signal id (optional)
+            
+        Returns:
+            List of TradingExecution instances, one per signal
+        """
+        signals = list(signals)
+        if not signals:
+            return []
+        
+        quantities = quantities or {}
+        prices = self.angel_api.get_ltp_bulk({signal.symbol_id: signal.symbol for signal in signals}.values())
+        
+        # Portfolio value is sized against once for the whole batch, and only
+        # when some signal has no quantity from the caller
+        portfolio_value = None
+        if any(signal.id not in quantities for signal in signals):
+            portfolio_value = self.portfolio_service.get_total_value(bot.portfolio)
+        
+        # Insert every PENDING record in one statement before any order goes out
+        pending = [
+            TradingExecution(
+                bot=bot,
+                signal=signal,
+                execution_type='SIGNAL_ENTRY',
+                quantity=(
+                    quantities[signal.id] if signal.id in quantities
+                    else self._calculate_position_size(signal, bot, portfolio_value)
+                ),
+                requested_price=signal.entry_price,
+                status='PENDING'
+            )
+            for signal in signals
+        ]
+        TradingExecution.objects.bulk_create(pending)
+        
+        outcomes = []
+        for signal, execution in zip(signals, pending):
+            symbol = signal.symbol.symbol
+            self.logger.info("Executing signal: %s %s", signal.signal_type, symbol)
+            try:
+                success, result = self._place_order(
+                    signal, execution.quantity, bot.is_paper_trading, prices.get(symbol)
+                )
+            except Exception as e:
+                self.logger.error("Error executing signal %s: %s", signal.id, e)
+                success, result = False, {'error': str(e)}
+            outcomes.append((signal, execution, success, result))
+        
+        # bulk_update skips auto_now, so updated_at is stamped by hand
+        now = timezone.now()
+        executed_signals = []
+        with transaction.atomic():
+            for signal, execution, success, result in outcomes:
+                self._record_outcome(signal, execution, bot, success, result, now)
+                execution.updated_at = now
+                if success:
+                    signal.updated_at = now
+                    executed_signals.append(signal)
+            
+            TradingExecution.objects.bulk_update(
+                pending, ['status', 'executed_price', 'order_id', 'error_message', 'updated_at'], batch_size=500
+            )
+            TradingSignal.objects.bulk_update(
+                executed_signals, ['is_executed', 'executed_at', 'execution_price', 'updated_at'], batch_size=500
+            )
+        
+        for signal, execution, success, result in outcomes:
+            self._log_outcome(signal, execution, bot, success)
+        
+        return pending
+    
+    def execute_signal(self, signal: TradingSignal, bot: TradingBot, quantity=None, ltp=None, portfolio_value=None):
         """
         Execute a trading signal (BUY/SELL).
         
@@ -39,79 +125,94 @@ class TradingExecutor:
             signal: TradingSignal instance
             bot: TradingBot instance
             quantity: Override quantity (optional)
+            ltp: Already-fetched market price for the symbol (optional)
+            portfolio_value: Already-computed portfolio value for sizing (optional)
             
         Returns:
             TradingExecution instance
         """
-        self.logger.info(f"Executing signal: {signal.signal_type} {signal.symbol.symbol}")
+        self.logger.info("Executing signal: %s %s", signal.signal_type, signal.symbol.symbol)
         
+        execution = None
         try:
+            # Calculate position size if not provided
+            if quantity is None:
+                quantity = self._calculate_position_size(signal, bot, portfolio_value)
+            
+            # Create execution record (autocommitted, so no locks are held
+            # while the order goes out over the network)
+            execution = TradingExecution.objects.create(
+                bot=bot,
+                signal=signal,
+                execution_type='SIGNAL_ENTRY',
+                quantity=quantity,
+                requested_price=signal.entry_price,
+                status='PENDING'
+            )
+            
+            # Execute the order
+            success, result = self._place_order(signal, quantity, bot.is_paper_trading, ltp)
+            
+            # Record the outcome in one short transaction
             with transaction.atomic():
-                # Calculate position size if not provided
-                if quantity is None:
-                    quantity = self._calculate_position_size(signal, bot)
-                
-                # Create execution record
-                execution = TradingExecution.objects.create(
-                    bot=bot,
-                    signal=signal,
-                    execution_type='SIGNAL_ENTRY',
-                    quantity=quantity,
-                    requested_price=signal.entry_price,
-                    status='PENDING'
-                )
-                
-                # Execute the order
-                success, result = self._place_order(signal, quantity, bot.is_paper_trading)
-                
+                self._record_outcome(signal, execution, bot, success, result)
                 if success:
-                    execution.status = 'EXECUTED'
-                    execution.executed_price = result.get('executed_price', signal.entry_price)
-                    execution.order_id = result.get('order_id', '')
-                    
-                    # Mark signal as executed
-                    signal.is_executed = True
-                    signal.executed_at = timezone.now()
-                    signal.execution_price = execution.executed_price
-                    signal.save()
-                    
-                    # Update portfolio
-                    self._update_portfolio(signal, quantity, execution.executed_price, bot)
-                    
-                    # Set up stop loss and take profit orders
-                    self._setup_exit_orders(signal, execution, bot)
-                    
-                    self.logger.info(f"Successfully executed {signal.signal_type} order for {signal.symbol.symbol}")
-                    
-                else:
-                    execution.status = 'FAILED'
-                    execution.error_message = result.get('error', 'Unknown error')
-                    self.logger.error(f"Failed to execute order: {execution.error_message}")
-                
-                execution.save()
-                return execution
+                    signal.save(update_fields=['is_executed', 'executed_at', 'execution_price', 'updated_at'])
+                execution.save(update_fields=['status', 'executed_price', 'order_id', 'error_message', 'updated_at'])
+            
+            self._log_outcome(signal, execution, bot, success)
+            
+            return execution
                 
         except Exception as e:
-            self.logger.error(f"Error executing signal: {e}")
-            if 'execution' in locals():
+            self.logger.error("Error executing signal: %s", e)
+            if execution is not None:
                 execution.status = 'FAILED'
                 execution.error_message = str(e)
-                execution.save()
+                execution.save(update_fields=['status', 'error_message', 'updated_at'])
             raise
     
-    def _calculate_position_size(self, signal: TradingSignal, bot: TradingBot):
+    def _record_outcome(self, signal: TradingSignal, execution: TradingExecution, bot: TradingBot, success, result, now=None):
+        """Apply an order result to the execution and signal in memory and update the portfolio."""
+        if success:
+            execution.status = 'EXECUTED'
+            execution.executed_price = result.get('executed_price', signal.entry_price)
+            execution.order_id = result.get('order_id', '')
+            
+            # Mark signal as executed
+            signal.is_executed = True
+            signal.executed_at = now or timezone.now()
+            signal.execution_price = execution.executed_price
+            
+            # Update portfolio
+            self._update_portfolio(signal, execution.quantity, execution.executed_price, bot)
+        else:
+            execution.status = 'FAILED'
+            execution.error_message = result.get('error', 'Unknown error')
+    
+    def _log_outcome(self, signal: TradingSignal, execution: TradingExecution, bot: TradingBot, success):
+        """Set up exit orders for a recorded fill, or log the failure."""
+        if success:
+            # Set up stop loss and take profit orders
+            self._setup_exit_orders(signal, execution, bot)
+            
+            self.logger.info("Successfully executed %s order for %s", signal.signal_type, signal.symbol.symbol)
+        else:
+            self.logger.error("Failed to execute order: %s", execution.error_message)
+    
+    def _calculate_position_size(self, signal: TradingSignal, bot: TradingBot, portfolio_value=None):
         """Calculate position size based on bot configuration or signal-specific quantity."""
         try:
             # Check if signal has a fixed quantity (for small-cap strategy)
-            if hasattr(signal, 'analysis_data') and signal.analysis_data:
-                fixed_quantity = signal.analysis_data.get('fixed_quantity')
-                if fixed_quantity:
-                    self.logger.info(f"Using fixed quantity from signal: {fixed_quantity} shares for {signal.symbol.symbol}")
-                    return int(fixed_quantity)
+            fixed_quantity = (signal.analysis_data or {}).get('fixed_quantity')
+            if fixed_quantity:
+                self.logger.info("Using fixed quantity from signal: %s shares for %s", fixed_quantity, signal.symbol.symbol)
+                return int(fixed_quantity)
             
             # Fallback to percentage-based calculation
-            # Get portfolio value
-            portfolio_value = self.portfolio_service.get_total_value(bot.portfolio)
+            # Get portfolio value, unless the caller already has it
+            if portfolio_value is None:
+                portfolio_value = self.portfolio_service.get_total_value(bot.portfolio)
             
             # Calculate position value based on percentage
             position_value = portfolio_value * (bot.position_size / 100)
@@ -122,38 +223,46 @@ class TradingExecutor:
             # Ensure minimum quantity of 1
             quantity = max(1, quantity)
             
-            self.logger.info(f"Calculated position size: {quantity} shares for {signal.symbol.symbol}")
+            self.logger.info("Calculated position size: %s shares for %s", quantity, signal.symbol.symbol)
             return quantity
             
         except Exception as e:
-            self.logger.error(f"Error calculating position size: {e}")
+            self.logger.error("Error calculating position size: %s", e)
             return 1  # Default to 1 share
     
-    def _place_order(self, signal: TradingSignal, quantity: int, is_paper_trading: bool):
+    def _current_price(self, signal: TradingSignal, ltp=None):
+        """Return the pre-fetched LTP, or quote the signal's symbol on its own."""
+        symbol = signal.symbol
+        if ltp is None:
+            ltp = self.angel_api.get_ltp_bulk([symbol]).get(symbol.symbol)
+        if ltp is None:
+            raise ValueError(f"No market price available for {symbol.symbol}")
+        return ltp
+    
+    def _place_order(self, signal: TradingSignal, quantity: int, is_paper_trading: bool, ltp=None):
         """Place buy/sell order via Angel One API or paper trading."""
         
         if is_paper_trading:
-            return self._execute_paper_trade(signal, quantity)
+            return self._execute_paper_trade(signal, quantity, ltp)
         else:
-            return self._execute_real_trade(signal, quantity)
+            return self._execute_real_trade(signal, quantity, ltp)
     
-    def _execute_paper_trade(self, signal: TradingSignal, quantity: int):
+    def _execute_paper_trade(self, signal: TradingSignal, quantity: int, ltp=None):
         """Execute paper trade (simulation)."""
         try:
             # Get current market price
-            current_price = self.angel_api.get_ltp(signal.symbol.symbol)
+            current_price = self._current_price(signal, ltp)
             
-            # Simulate order execution with slight slippage
-            slippage = 0.001  # 0.1% slippage
+            # Simulate order execution with slight slippage, in integer paise;
+            # buys round up and sells round down to the next paisa
+            paise = int(Decimal(str(current_price)) * 100)
             if signal.signal_type == 'BUY':
-                executed_price = current_price * (1 + slippage)
+                paise = (paise * self.SLIPPAGE_NUM + self.SLIPPAGE_DEN - 1) // self.SLIPPAGE_DEN
             else:
-                executed_price = current_price * (1 - slippage)
+                paise = paise * (2 * self.SLIPPAGE_DEN - self.SLIPPAGE_NUM) // self.SLIPPAGE_DEN
+            executed_price = Decimal(paise).scaleb(-2)
             
-            # Round to 2 decimal places
-            executed_price = Decimal(executed_price).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-            
-            self.logger.info(f"Paper trade executed: {signal.signal_type} {quantity} {signal.symbol.symbol} @ ₹{executed_price}")
+            self.logger.info("Paper trade executed: %s %s %s @ ₹%s", signal.signal_type, quantity, signal.symbol.symbol, executed_price)
             
             return True, {
                 'order_id': f'PAPER_{int(time.time())}',
@@ -164,16 +273,17 @@ class TradingExecutor:
         except Exception as e:
             return False, {'error': str(e)}
     
-    def _execute_real_trade(self, signal: TradingSignal, quantity: int):
+    def _execute_real_trade(self, signal: TradingSignal, quantity: int, ltp=None):
         """Execute real trade via Angel One API."""
         try:
             # Determine order type and transaction type
             transaction_type = signal.signal_type  # BUY or SELL
             order_type = 'MARKET'  # Use market orders for immediate execution
+            symbol = signal.symbol.symbol
             
             # Place order via Angel One API
-            success, order_id = self.angel_api.place_order(
-                symbol=signal.symbol.symbol,
+            success, order_id, fill_price = self.angel_api.place_order(
+                symbol=symbol,
                 quantity=quantity,
                 price=None,  # Market order
                 order_type=order_type,
@@ -181,10 +291,10 @@ class TradingExecutor:
             )
             
             if success:
-                # Get execution details
-                executed_price = self.angel_api.get_ltp(signal.symbol.symbol)
+                # Use the broker's average fill price, quoting only if it has none
+                executed_price = fill_price if fill_price is not None else self._current_price(signal, ltp)
                 
-                self.logger.info(f"Real trade executed: {transaction_type} {quantity} {signal.symbol.symbol} @ ₹{executed_price}")
+                self.logger.info("Real trade executed: %s %s %s @ ₹%s", transaction_type, quantity, symbol, executed_price)
                 
                 return True, {
                     'order_id': order_id,
@@ -215,33 +325,37 @@ class TradingExecutor:
                     sale_price=executed_price
                 )
                 
-            self.logger.info(f"Portfolio updated for {signal.signal_type} {quantity} {signal.symbol.symbol}")
+            self.logger.info("Portfolio updated for %s %s %s", signal.signal_type, quantity, signal.symbol.symbol)
             
         except Exception as e:
-            self.logger.error(f"Error updating portfolio: {e}")
+            self.logger.error("Error updating portfolio: %s", e)
     
     def _setup_exit_orders(self, signal: TradingSignal, execution: TradingExecution, bot: TradingBot):
         """Set up stop loss and take profit orders."""
         try:
             if signal.signal_type == 'BUY':
+                executed_price = Decimal(str(execution.executed_price))
+                
                 # Set up stop loss
                 if signal.stop_loss_price or bot.stop_loss_percent:
+                    stop_loss_fraction = Decimal(str(bot.stop_loss_percent)) / HUNDRED
                     stop_loss_price = signal.stop_loss_price or (
-                        execution.executed_price * (1 - bot.stop_loss_percent / 100)
-                    )
+                        executed_price * (ONE - stop_loss_fraction)
+                    ).quantize(ONE_CENT, rounding=ROUND_HALF_UP)
                     self._create_exit_signal(signal, stop_loss_price, 'STOP_LOSS', bot)
                 
                 # Set up take profit
                 if signal.target_price or bot.take_profit_percent:
+                    take_profit_fraction = Decimal(str(bot.take_profit_percent)) / HUNDRED
                     take_profit_price = signal.target_price or (
-                        execution.executed_price * (1 + bot.take_profit_percent / 100)
-                    )
+                        executed_price * (ONE + take_profit_fraction)
+                    ).quantize(ONE_CENT, rounding=ROUND_HALF_UP)
                     self._create_exit_signal(signal, take_profit_price, 'TAKE_PROFIT', bot)
             
             # For SELL signals, the logic would be reversed
             
         except Exception as e:
-            self.logger.error(f"Error setting up exit orders: {e}")
+            self.logger.error("Error setting up exit orders: %s", e)
     
     def _create_exit_signal(self, original_signal: TradingSignal, exit_price: Decimal, exit_type: str, bot: TradingBot):
         """Create exit signal for stop loss or take profit."""
@@ -251,40 +365,80 @@ class TradingExecutor:
             
             # This would typically be handled by a monitoring service
             # For now, we just log the intention
-            self.logger.info(f"Exit order setup: {exit_type} at ₹{exit_price} for {original_signal.symbol.symbol}")
+            self.logger.info("Exit order setup: %s at ₹%s for %s", exit_type, exit_price, original_signal.symbol.symbol)
             
         except Exception as e:
-            self.logger.error(f"Error creating exit signal: {e}")
+            self.logger.error("Error creating exit signal: %s", e)
 
 
 class OrderMonitor:
     """Monitor and manage active orders."""
     
+    MAX_WORKERS = 16
+    
     def __init__(self):
+        from angel_api.services import get_client
+        
         self.logger = logging.getLogger('order_monitor')
-        self.angel_api = AngelOneAPI()
+        self.angel_api = get_client()
         self.executor = TradingExecutor()
     
     def monitor_positions(self, bot: TradingBot):
         """Monitor active positions for stop loss and take profit triggers."""
+        self.monitor_all([bot])
+    
+    def monitor_all(self, bots):
+        """Monitor the active positions of several bots with one query and one quote call."""
         try:
-            # Get bot's active executions
-            active_executions = TradingExecution.objects.filter(
-                bot=bot,
+            bots_by_id = {bot.id: bot for bot in bots}
+            
+            # Get every bot's active executions
+            active_executions = list(TradingExecution.objects.filter(
+                bot_id__in=list(bots_by_id),
                 status='EXECUTED'
-            ).select_related('signal')
+            ).select_related('signal__symbol').only(
+                'id', 'quantity', 'bot', 'signal__signal_type', 'signal__stop_loss_price',
+                'signal__target_price', 'signal__strategy', 'signal__symbol__symbol',
+                'signal__symbol__token', 'signal__symbol__exchange'
+            ))
+            if not active_executions:
+                return
             
+            # Every row belongs to a bot the caller passed in; reuse it rather than join it
             for execution in active_executions:
-                self._check_exit_conditions(execution)
+                execution.bot = bots_by_id[execution.bot_id]
+            
+            # Quote every open symbol at once, then check exits in parallel so
+            # triggered exit orders don't queue behind each other
+            prices = self.angel_api.get_ltp_bulk(
+                {execution.signal.symbol_id: execution.signal.symbol for execution in active_executions}.values()
+            )
+            
+            with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(active_executions))) as pool:
+                list(pool.map(
+                    lambda execution: self._check_exit_conditions_in_thread(
+                        execution, prices.get(execution.signal.symbol.symbol)
+                    ),
+                    active_executions
+                ))
                 
         except Exception as e:
-            self.logger.error(f"Error monitoring positions: {e}")
+            self.logger.error("Error monitoring positions: %s", e)
     
-    def _check_exit_conditions(self, execution: TradingExecution):
+    def _check_exit_conditions_in_thread(self, execution: TradingExecution, current_price):
+        """Run an exit check on a pool thread, closing that thread's DB connection afterwards."""
+        try:
+            self._check_exit_conditions(execution, current_price)
+        finally:
+            connection.close()
+    
+    def _check_exit_conditions(self, execution: TradingExecution, current_price):
         """Check if position should be closed based on stop loss or take profit."""
         try:
             signal = execution.signal
-            current_price = self.angel_api.get_ltp(signal.symbol.symbol)
+            if current_price is None:
+                self.logger.warning("No market price for %s, skipping exit check", signal.symbol.symbol)
+                return
             
             if signal.signal_type == 'BUY':
                 # Check stop loss
@@ -298,14 +452,14 @@ class OrderMonitor:
             # Similar logic for SELL positions would go here
             
         except Exception as e:
-            self.logger.error(f"Error checking exit conditions: {e}")
+            self.logger.error("Error checking exit conditions: %s", e)
     
     def _trigger_exit(self, execution: TradingExecution, exit_type: str, current_price: Decimal):
         """Trigger exit order."""
         try:
             # Create exit signal
             exit_signal = TradingSignal.objects.create(
-                strategy=execution.signal.strategy,
+                strategy_id=execution.signal.strategy_id,
                 symbol=execution.signal.symbol,
                 signal_type='SELL' if execution.signal.signal_type == 'BUY' else 'BUY',
                 confidence=90,  # High confidence for exit signals
@@ -314,19 +468,49 @@ class OrderMonitor:
             )
             
             # Execute exit order
-            self.executor.execute_signal(exit_signal, execution.bot, execution.quantity)
+            self.executor.execute_signal(exit_signal, execution.bot, execution.quantity, ltp=current_price)
             
-            self.logger.info(f"Exit triggered: {exit_type} for {execution.signal.symbol.symbol}")
+            self.logger.info("Exit triggered: %s for %s", exit_type, execution.signal.symbol.symbol)
             
         except Exception as e:
-            self.logger.error(f"Error triggering exit: {e}")
+            self.logger.error("Error triggering exit: %s", e)
 
 
 class RiskManager:
     """Risk management for trading operations."""
     
+    # NSE session bounds as (hour, minute) in local (IST) time
+    MARKET_OPEN = (9, 15)
+    MARKET_CLOSE = (15, 30)
+    
     def __init__(self):
         self.logger = logging.getLogger('risk_manager')
+        self._position_counts = {}
+        self._tick_market_open = None
+    
+    def set_tick_context(self, market_open=None):
+        """Fix the market-open state for the current tick, checking the clock when not given."""
+        self._tick_market_open = self._market_open_now() if market_open is None else market_open
+    
+    def prime(self, bots):
+        """Load executed-position counts for all bots in one query, for the current cycle."""
+        bot_ids = [bot.id for bot in bots]
+        counts = dict.fromkeys(bot_ids, 0)
+        counts.update(
+            TradingExecution.objects.filter(bot_id__in=bot_ids, status='EXECUTED')
+            .order_by().values('bot_id').annotate(count=Count('id')).values_list('bot_id', 'count')
+        )
+        self._position_counts = counts
+    
+    def record_execution(self, bot: TradingBot):
+        """Count a new execution against a primed bot's position limit."""
+        if bot.id in self._position_counts:
+            self._position_counts[bot.id] += 1
+    
+    def release_execution(self, bot: TradingBot):
+        """Give back a slot recorded for an order that did not execute."""
+        if self._position_counts.get(bot.id):
+            self._position_counts[bot.id] -= 1
     
     def validate_order(self, signal: TradingSignal, bot: TradingBot, quantity: int):
         """Validate order against risk parameters."""
@@ -346,16 +530,18 @@ class RiskManager:
             return True, "Order validated"
             
         except Exception as e:
-            self.logger.error(f"Error validating order: {e}")
+            self.logger.error("Error validating order: %s", e)
             return False, str(e)
     
     def _check_position_limits(self, signal: TradingSignal, bot: TradingBot, quantity: int):
         """Check if order exceeds position limits."""
-        # Check max positions per strategy
-        active_positions = TradingExecution.objects.filter(
-            bot=bot,
-            status='EXECUTED'
-        ).count()
+        # Check max positions per strategy, from the primed counts when available
+        active_positions = self._position_counts.get(bot.id)
+        if active_positions is None:
+            active_positions = TradingExecution.objects.filter(
+                bot=bot,
+                status='EXECUTED'
+            ).count()
         
         return active_positions < bot.max_positions
     
@@ -371,20 +557,34 @@ class RiskManager:
         return True  # Placeholder
     
     def _is_market_open(self):
+        """Check if market is open, using the tick context when one is set."""
+        if self._tick_market_open is not None:
+            return self._tick_market_open
+        return self._market_open_now()
+    
+    def _market_open_now(self):
         """Check if market is currently open."""
-        now = timezone.now()
+        now = timezone.localtime()
         
         # NSE trading hours: 9:15 AM to 3:30 PM IST (Monday to Friday)
         if now.weekday() > 4:  # Saturday or Sunday
             return False
         
-        market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
-        market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
-        
-        return market_open <= now <= market_close
+        return self.MARKET_OPEN <= (now.hour, now.minute) <= self.MARKET_CLOSE
+
+
+# Main execution service instances, built on first access
+_SERVICE_FACTORIES = {
+    'trading_executor': TradingExecutor,
+    'order_monitor': OrderMonitor,
+    'risk_manager': RiskManager,
+}
 
 
-# Main execution service instance
-trading_executor = TradingExecutor()
-order_monitor = OrderMonitor()
-risk_manager = RiskManager()
+def __getattr__(name):
+    """Create a module-level service instance the first time it is imported."""
+    factory = _SERVICE_FACTORIES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    instance = globals()[name] = factory()
+    return instance
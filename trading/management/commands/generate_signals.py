@@ -13,6 +13,10 @@ from angel_api.models import NSESymbol
 from portfolio.models import Portfolio
 from django.contrib.auth.models import User
 
+# Test fixtures already resolved in this process, so repeated call_command
+# runs skip their get_or_create round-trips
+_fixture_cache = {}
+
 
 class Command(BaseCommand):
     help = 'Generate sample trading signals for testing'
@@ -43,6 +47,12 @@ class Command(BaseCommand):
             default=75,
             help='Signal confidence (0-100, default: 75)',
         )
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=1,
+            help='Number of signals to generate (default: 1)',
+        )
     
     def handle(self, *args, **options):
         """Generate trading signals."""
@@ -50,6 +60,7 @@ class Command(BaseCommand):
         signal_type = options['signal_type']
         price = Decimal(str(options['price']))
         confidence = options['confidence']
+        count = options['count']
         
         self.stdout.write("=" * 60)
         self.stdout.write(self.style.SUCCESS('[SIGNAL GENERATOR] Creating Trading Signals'))
@@ -61,13 +72,13 @@ class Command(BaseCommand):
             symbol = self._get_or_create_symbol(symbol_name)
             bot = self._get_or_create_bot(strategy)
             
-            # Create trading signal
-            signal = self._create_signal(strategy, symbol, signal_type, price, confidence)
+            # Create trading signals
+            signals = self._create_signals(strategy, symbol, signal_type, price, confidence, count)
             
-            self.stdout.write(f'[CREATED] {signal_type} signal for {symbol_name}')
+            self.stdout.write(f'[CREATED] {len(signals)} {signal_type} signal(s) for {symbol_name}')
             self.stdout.write(f'[PRICE] Entry: ₹{price}')
             self.stdout.write(f'[CONFIDENCE] {confidence}%')
-            self.stdout.write(f'[SIGNAL ID] {signal.id}')
+            self.stdout.write(f'[SIGNAL ID] {", ".join(str(signal.id) for signal in signals)}')
             
             self.stdout.write("=" * 60)
             self.stdout.write(self.style.SUCCESS('[SUCCESS] Signal generated successfully!'))
@@ -80,6 +91,9 @@ class Command(BaseCommand):
     
     def _get_or_create_strategy(self):
         """Get or create a test trading strategy."""
+        if 'strategy' in _fixture_cache:
+            return _fixture_cache['strategy']
+        
         strategy, created = TradingStrategy.objects.get_or_create(
             name='Test Strategy',
             defaults={
@@ -99,11 +113,16 @@ class Command(BaseCommand):
             self.stdout.write('[CREATED] Test strategy')
         else:
             self.stdout.write('[FOUND] Existing test strategy')
-            
+        
+        _fixture_cache['strategy'] = strategy
         return strategy
     
     def _get_or_create_symbol(self, symbol_name):
         """Get or create a test symbol."""
+        key = ('symbol', symbol_name)
+        if key in _fixture_cache:
+            return _fixture_cache[key]
+        
         symbol, created = NSESymbol.objects.get_or_create(
             symbol=symbol_name,
             defaults={
@@ -120,11 +139,15 @@ class Command(BaseCommand):
             self.stdout.write(f'[CREATED] Symbol {symbol_name}')
         else:
             self.stdout.write(f'[FOUND] Existing symbol {symbol_name}')
-            
+        
+        _fixture_cache[key] = symbol
         return symbol
     
     def _get_or_create_bot(self, strategy):
         """Get or create a test trading bot."""
+        if 'bot' in _fixture_cache:
+            return _fixture_cache['bot']
+        
         # Get or create test user
         user, created = User.objects.get_or_create(
             username='test_trader',
@@ -171,11 +194,12 @@ class Command(BaseCommand):
             self.stdout.write('[CREATED] Test trading bot')
         else:
             self.stdout.write('[FOUND] Existing test bot')
-            
+        
+        _fixture_cache['bot'] = bot
         return bot
     
-    def _create_signal(self, strategy, symbol, signal_type, price, confidence):
-        """Create a trading signal."""
+    def _create_signals(self, strategy, symbol, signal_type, price, confidence, count=1):
+        """Create count identical trading signals in one bulk insert."""
         # Calculate target and stop loss prices
         if signal_type == 'BUY':
             target_price = price * Decimal('1.05')  # 5% profit target
@@ -184,22 +208,26 @@ class Command(BaseCommand):
             target_price = price * Decimal('0.95')  # 5% profit target
             stop_loss_price = price * Decimal('1.02')  # 2% stop loss
         
-        signal = TradingSignal.objects.create(
-            strategy=strategy,
-            symbol=symbol,
-            signal_type=signal_type,
-            confidence=Decimal(str(confidence)),
-            entry_price=price,
-            target_price=target_price,
-            stop_loss_price=stop_loss_price,
-            signal_strength='STRONG' if confidence >= 80 else 'MODERATE',
-            analysis_data={
-                'generated_by': 'signal_generator',
-                'timestamp': timezone.now().isoformat(),
-                'test_signal': True
-            },
-            is_active=True,
-            expires_at=timezone.now() + timezone.timedelta(hours=1)  # Expire in 1 hour
-        )
+        now = timezone.now()
+        signals = [
+            TradingSignal(
+                strategy=strategy,
+                symbol=symbol,
+                signal_type=signal_type,
+                confidence=Decimal(str(confidence)),
+                entry_price=price,
+                target_price=target_price,
+                stop_loss_price=stop_loss_price,
+                signal_strength='STRONG' if confidence >= 80 else 'MODERATE',
+                analysis_data={
+                    'generated_by': 'signal_generator',
+                    'timestamp': now.isoformat(),
+                    'test_signal': True
+                },
+                is_active=True,
+                expires_at=now + timezone.timedelta(hours=1)  # Expire in 1 hour
+            )
+            for _ in range(count)
+        ]
         
-        return signal
+        return TradingSignal.objects.bulk_create(signals, batch_size=500)
@@ -3,6 +3,7 @@
 import sqlite3
 from datetime import datetime
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.contrib.auth.models import User
 from portfolio.models import Portfolio, Trade
 from portfolio.services import PortfolioService
@@ -12,6 +13,8 @@ from angel_api.models import NSESymbol
 class Command(BaseCommand):
     help = 'Migrate data from old SQLite database to Django models'
     
+    BATCH_SIZE = 1000
+    
     def add_arguments(self, parser):
         parser.add_argument(
             '--db-path',
@@ -63,6 +66,12 @@ class Command(BaseCommand):
                 portfolio.save()
                 self.stdout.write(f"Migrated balance: ₹{balance_row[0]}")
             
+            # Resolve every traded symbol up front, creating missing ones in one insert
+            cursor.execute('SELECT DISTINCT symbol, exchange FROM trade_metadata')
+            symbol_map = self._resolve_symbols(
+                (symbol_name, exchange or 'NSE') for symbol_name, exchange in cursor.fetchall()
+            )
+            
             # Migrate trades
             cursor.execute('''
                 SELECT symbol, price, qty, timestamp, action, buy_amount, 
@@ -73,7 +82,8 @@ class Command(BaseCommand):
             ''')
             
             trades_migrated = 0
-            for row in cursor.fetchall():
+            pending = []
+            for row in self._iter_rows(cursor):
                 try:
                     symbol_name = row[0]
                     price = row[1]
@@ -91,23 +101,23 @@ class Command(BaseCommand):
                     holding_days = row[13]
                     ref_trade_id = row[14]
                     
+                    # Rows the trade table can't hold are skipped, not inserted
+                    if price is None or quantity is None or not action:
+                        raise ValueError(f"missing price, qty or action for {symbol_name}")
+                    
                     # Parse timestamp
                     try:
                         timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
                     except:
                         timestamp = datetime.now()
                     
-                    # Get or create symbol
-                    symbol, created = NSESymbol.objects.get_or_create(
-                        symbol=symbol_name,
-                        exchange=exchange,
-                        defaults={'token': symbol_name, 'lot_size': 1}
-                    )
+                    # Look up the pre-resolved symbol
+                    symbol_id = symbol_map[(symbol_name, exchange)]
                     
-                    # Create trade
-                    trade = Trade.objects.create(
+                    # Build the trade; rows are inserted in batches below
+                    pending.append((Trade(
                         portfolio=portfolio,
-                        symbol=symbol,
+                        symbol_id=symbol_id,
                         price=price,
                         quantity=quantity,
                         action=action,
@@ -120,19 +130,19 @@ class Command(BaseCommand):
                         remarks=remarks,
                         pnl_percent=pnl_percent,
                         holding_days=holding_days
-                    )
-                    
-                    # Set the created_at timestamp
-                    trade.created_at = timestamp
-                    trade.save()
-                    
-                    trades_migrated += 1
+                    ), timestamp))
                     
                 except Exception as e:
                     self.stdout.write(
                         self.style.ERROR(f"Error migrating trade: {e}")
                     )
+                
+                if len(pending) >= self.BATCH_SIZE:
+                    trades_migrated += self._insert_trades(pending)
+                    pending = []
             
+            trades_migrated += self._insert_trades(pending)
+        
             conn.close()
             
             self.stdout.write(
@@ -147,6 +157,73 @@ class Command(BaseCommand):
                 self.style.ERROR(f"Migration failed: {e}")
             )
     
+    def _iter_rows(self, cursor):
+        """Stream query results a batch at a time instead of loading the whole table."""
+        while True:
+            rows = cursor.fetchmany(self.BATCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+    
+    def _resolve_symbols(self, pairs):
+        """Map (symbol, exchange) pairs to NSESymbol ids, bulk-creating the missing ones."""
+        pairs = set(pairs)
+        names = {symbol_name for symbol_name, _ in pairs}
+        
+        def load():
+            return {
+                (symbol_name, exchange): symbol_id
+                for symbol_name, exchange, symbol_id in NSESymbol.objects.filter(
+                    symbol__in=names
+                ).values_list('symbol', 'exchange', 'id')
+            }
+        
+        symbol_map = load()
+        missing = pairs - symbol_map.keys()
+        if missing:
+            NSESymbol.objects.bulk_create(
+                [
+                    NSESymbol(symbol=symbol_name, exchange=exchange, token=symbol_name, lot_size=1)
+                    for symbol_name, exchange in missing
+                ],
+                ignore_conflicts=True
+            )
+            symbol_map = load()
+        
+        return symbol_map
+    
+    def _insert_trades(self, pending):
+        """Bulk-insert (trade, timestamp) pairs, retrying row by row if the batch fails."""
+        if not pending:
+            return 0
+        
+        try:
+            return self._insert_batch(pending)
+        except Exception:
+            # Insert one row at a time so only the bad rows are skipped
+            trades_migrated = 0
+            for trade, timestamp in pending:
+                trade.pk = None
+                try:
+                    trades_migrated += self._insert_batch([(trade, timestamp)])
+                except Exception as e:
+                    self.stdout.write(
+                        self.style.ERROR(f"Error migrating trade: {e}")
+                    )
+            return trades_migrated
+    
+    def _insert_batch(self, pending):
+        """Insert (trade, timestamp) pairs atomically and restore their original created_at."""
+        with transaction.atomic():
+            trades = Trade.bulk_execute([trade for trade, _ in pending], batch_size=self.BATCH_SIZE)
+            
+            # auto_now_add overwrites created_at on insert, so set it back in one UPDATE
+            for trade, timestamp in pending:
+                trade.created_at = timestamp
+            Trade.objects.bulk_update(trades, ['created_at'], batch_size=self.BATCH_SIZE)
+        
+        return len(trades)
+    
     def _update_positions(self, portfolio_service):
         """Update portfolio positions based on migrated trades."""
         # This would typically be handled by the portfolio service
@@ -58,7 +58,8 @@ class Command(BaseCommand):
         
         # Validate portfolio exists
         try:
-            portfolio = Portfolio.objects.get(id=portfolio_id)
+            # Only the name is shown here; the service loads what it needs by id
+            portfolio = Portfolio.objects.only('name').get(id=portfolio_id)
             self.stdout.write(
                 self.style.SUCCESS(f'Using portfolio: {portfolio.name} (ID: {portfolio_id})')
             )
@@ -79,6 +79,16 @@ class Command(BaseCommand):
                 iteration += 1
                 self.stdout.write(f'\n[CYCLE {iteration}] Running trading cycle at {timezone.now().strftime("%H:%M:%S")}')
                 
+                # Market hours are checked once per cycle
+                risk_manager.set_tick_context()
+                
+                # Check exits for every bot's open positions in one sweep
+                self._monitor_positions(bots, paper_only)
+                
+                # Position counts for every bot in one query, taken after
+                # monitoring so exit executions it created are counted
+                risk_manager.prime(bots)
+                
                 for bot in bots:
                     if not self.running:
                         break
@@ -111,23 +121,16 @@ class Command(BaseCommand):
             if paper_only:
                 bot.is_paper_trading = True
             
-            # 1. Monitor existing positions
-            order_monitor.monitor_positions(bot)
+            # 1. Check for new signals
+            new_signals = list(self._get_pending_signals(bot))
             
-            # 2. Check for new signals
-            new_signals = self._get_pending_signals(bot)
-            
-            if new_signals.exists():
-                self.stdout.write(f'[SIGNALS] Found {new_signals.count()} pending signal(s)')
-                
-                for signal in new_signals:
-                    if not self.running:
-                        break
-                    self._process_signal(signal, bot)
+            if new_signals:
+                self.stdout.write(f'[SIGNALS] Found {len(new_signals)} pending signal(s)')
+                self._process_signals(new_signals, bot)
             else:
                 self.stdout.write('[SIGNALS] No new signals to process')
             
-            # 3. Update bot statistics
+            # 2. Update bot statistics
             self._update_bot_stats(bot)
             
             # Restore original paper trading mode
@@ -140,6 +143,22 @@ class Command(BaseCommand):
             bot.last_error = str(e)
             bot.save()
     
+    def _monitor_positions(self, bots, paper_only: bool = False):
+        """Monitor existing positions for all bots at once."""
+        bots = list(bots)
+        original_paper_modes = [bot.is_paper_trading for bot in bots]
+        
+        # Force paper trading if requested, so exits are simulated too
+        if paper_only:
+            for bot in bots:
+                bot.is_paper_trading = True
+        
+        try:
+            order_monitor.monitor_all(bots)
+        finally:
+            for bot, original_paper_mode in zip(bots, original_paper_modes):
+                bot.is_paper_trading = original_paper_mode
+    
     def _get_pending_signals(self, bot: TradingBot):
         """Get pending signals for the bot's strategy."""
         return TradingSignal.objects.filter(
@@ -148,39 +167,62 @@ class Command(BaseCommand):
             is_executed=False
         ).exclude(
             signal_type='HOLD'
-        ).order_by('-confidence', '-created_at')
+        ).select_related('symbol').order_by('-confidence', '-created_at')
     
-    def _process_signal(self, signal: TradingSignal, bot: TradingBot):
-        """Process a trading signal."""
-        try:
-            self.stdout.write(f'[SIGNAL] Processing {signal.signal_type} {signal.symbol.symbol} @ ₹{signal.entry_price}')
-            
-            # Calculate quantity
-            quantity = self._calculate_quantity(signal, bot)
-            
-            # Validate order with risk manager
-            is_valid, validation_message = risk_manager.validate_order(signal, bot, quantity)
-            
-            if not is_valid:
-                self.stdout.write(self.style.WARNING(f'[RISK] Order rejected: {validation_message}'))
-                return
-            
-            # Execute the signal
-            execution = trading_executor.execute_signal(signal, bot, quantity)
+    def _process_signals(self, signals, bot: TradingBot):
+        """Validate pending signals, then execute the accepted ones in one batch."""
+        accepted = []
+        quantities = {}
+        
+        for signal in signals:
+            if not self.running:
+                break
             
+            try:
+                self.stdout.write(f'[SIGNAL] Processing {signal.signal_type} {signal.symbol.symbol} @ ₹{signal.entry_price}')
+                
+                # Calculate quantity
+                quantity = self._calculate_quantity(signal, bot)
+                
+                # Validate order with risk manager
+                is_valid, validation_message = risk_manager.validate_order(signal, bot, quantity)
+                
+                if not is_valid:
+                    self.stdout.write(self.style.WARNING(f'[RISK] Order rejected: {validation_message}'))
+                    continue
+                
+                # Hold the slot so later signals in this batch count it against max_positions
+                risk_manager.record_execution(bot)
+                accepted.append(signal)
+                quantities[signal.id] = quantity
+                
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'[SIGNAL ERROR] {e}'))
+        
+        if not accepted:
+            return
+        
+        # Execute the accepted signals with one quote call and batched writes
+        try:
+            executions = trading_executor.execute_signals_batch(accepted, bot, quantities)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'[SIGNAL ERROR] {e}'))
+            for _ in accepted:
+                risk_manager.release_execution(bot)
+            return
+        
+        for signal, execution in zip(accepted, executions):
             if execution.status == 'EXECUTED':
                 self.stdout.write(
                     self.style.SUCCESS(
-                        f'[EXECUTED] {signal.signal_type} {quantity} {signal.symbol.symbol} @ ₹{execution.executed_price}'
+                        f'[EXECUTED] {signal.signal_type} {execution.quantity} {signal.symbol.symbol} @ ₹{execution.executed_price}'
                     )
                 )
             else:
+                risk_manager.release_execution(bot)
                 self.stdout.write(
                     self.style.ERROR(f'[FAILED] {execution.error_message}')
                 )
-                
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'[SIGNAL ERROR] {e}'))
     
     def _calculate_quantity(self, signal: TradingSignal, bot: TradingBot):
         """Calculate appropriate quantity for the signal."""
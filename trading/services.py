@@ -5,6 +5,7 @@ import json
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Sum
 from django.conf import settings
 from together import Together
 from .models import (
@@ -12,7 +13,8 @@ from .models import (
     MarketAnalysis, NewsAnalysis
 )
 from angel_api.models import NSESymbol
-from angel_api.services import AngelOneAPI
+from angel_api.services import get_client
+from portfolio.models import Trade
 from portfolio.services import PortfolioService
 from core.services import MarketService, RiskManager
 
@@ -22,12 +24,12 @@ class TradingStrategyService:
     
     def __init__(self):
         self.logger = logging.getLogger('trading')
-        self.angel_api = AngelOneAPI()
+        self.angel_api = get_client()
         self.market_service = MarketService()
         self.llm_client = Together(api_key=settings.LLM_CONFIG['API_KEY'])
     
-    def create_news_based_strategy(self, name, config=None):
-        """Create a news-based trading strategy."""
+    def _news_strategy_config(self, config=None):
+        """Build the parameters for a news-based strategy."""
         default_config = {
             'news_sources': ['economic_times', 'moneycontrol', 'business_standard'],
             'sentiment_threshold': 0.6,
@@ -41,17 +43,37 @@ class TradingStrategyService:
         if config:
             default_config.update(config)
         
+        return default_config
+    
+    def create_news_based_strategy(self, name, config=None):
+        """Create a news-based trading strategy."""
         strategy = TradingStrategy.objects.create(
             name=name,
             description="News-based trading strategy using sentiment analysis",
             strategy_type='NEWS_BASED',
-            config_parameters=default_config,
+            config_parameters=self._news_strategy_config(config),
             is_active=True
         )
         
         self.logger.info(f"Created news-based strategy: {name}")
         return strategy
     
+    def get_or_create_news_based_strategy(self, name, config=None):
+        """Get or create a news-based trading strategy by name."""
+        strategy, created = TradingStrategy.objects.get_or_create(
+            name=name,
+            defaults={
+                'description': "News-based trading strategy using sentiment analysis",
+                'strategy_type': 'NEWS_BASED',
+                'config_parameters': self._news_strategy_config(config),
+                'is_active': True
+            }
+        )
+        
+        if created:
+            self.logger.info(f"Created news-based strategy: {name}")
+        return strategy, created
+    
     def analyze_news_for_symbol(self, symbol_name, headlines, limit=5):
         """Analyze news headlines for trading signals."""
         try:
@@ -206,7 +228,7 @@ class TradingBotService:
         self.bot_id = bot_id
         self.bot = None
         self.logger = logging.getLogger('trading')
-        self.angel_api = AngelOneAPI()
+        self.angel_api = get_client()
         self.market_service = MarketService()
         self.risk_manager = RiskManager()
         
@@ -216,8 +238,8 @@ class TradingBotService:
             except TradingBot.DoesNotExist:
                 self.logger.error(f"Trading bot {bot_id} not found")
     
-    def create_bot(self, name, portfolio, strategy, config=None):
-        """Create a new trading bot."""
+    def _bot_config(self, config=None):
+        """Build the settings for a trading bot."""
         default_config = {
             'max_positions': 5,
             'position_size': 10.0,
@@ -230,16 +252,32 @@ class TradingBotService:
         if config:
             default_config.update(config)
         
+        return default_config
+    
+    def create_bot(self, name, portfolio, strategy, config=None):
+        """Create a new trading bot."""
         bot = TradingBot.objects.create(
             name=name,
             portfolio=portfolio,
             strategy=strategy,
-            **default_config
+            **self._bot_config(config)
         )
         
         self.logger.info(f"Created trading bot: {name}")
         return bot
     
+    def get_or_create_bot(self, name, portfolio, strategy, config=None):
+        """Get or create a trading bot by name within a portfolio."""
+        bot, created = TradingBot.objects.get_or_create(
+            name=name,
+            portfolio=portfolio,
+            defaults={'strategy': strategy, **self._bot_config(config)}
+        )
+        
+        if created:
+            self.logger.info(f"Created trading bot: {name}")
+        return bot, created
+    
     def run_bot_cycle(self):
         """Run a single bot trading cycle."""
         if not self.bot or not self.bot.is_active:
@@ -287,11 +325,11 @@ class TradingBotService:
     def _check_risk_limits(self, portfolio_service):
         """Check if bot can continue trading based on risk limits."""
         if self.bot.daily_loss_limit:
-            # Calculate today's P&L
-            today_trades = portfolio_service.get_trades().filter(
+            # Calculate today's P&L over all of today's trades, not the recent-trades slice
+            daily_pnl = Trade.objects.filter(
+                portfolio=portfolio_service.portfolio,
                 created_at__date=timezone.now().date()
-            )
-            daily_pnl = sum(trade.profit or 0 for trade in today_trades)
+            ).aggregate(total=Sum('profit'))['total'] or 0
             
             if daily_pnl < -self.bot.daily_loss_limit:
                 self.logger.warning(f"Daily loss limit exceeded: ₹{daily_pnl}")
@@ -357,7 +395,7 @@ class TradingBotService:
         try:
             # Place order
             if not self.bot.is_paper_trading:
-                success, order_id = self.angel_api.place_order(
+                success, order_id, _ = self.angel_api.place_order(
                     symbol=signal.symbol.symbol,
                     quantity=quantity,
                     price=signal.entry_price,
@@ -102,6 +102,52 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        # Hashed, long-cacheable names in production. The manifest only exists
+        # after `collectstatic`, so development keeps the plain storage.
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+        ),
+    },
+}
+
+# Cache (Redis when REDIS_URL is set, otherwise per-process memory)
+REDIS_URL = os.environ.get('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Celery (background jobs; broker defaults to the cache Redis)
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', REDIS_URL or 'redis://localhost:6379/0')
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TIMEZONE = TIME_ZONE
+
+# How often open position prices are refreshed in the background (seconds)
+POSITION_PRICE_REFRESH_INTERVAL = float(os.environ.get('POSITION_PRICE_REFRESH_INTERVAL', '60'))
+
+CELERY_BEAT_SCHEDULE = {
+    'refresh-position-prices': {
+        'task': 'portfolio.tasks.refresh_all_position_prices',
+        'schedule': POSITION_PRICE_REFRESH_INTERVAL,
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -161,12 +207,10 @@ NGROK_ENABLED = os.environ.get('NGROK_ENABLED', 'False').lower() == 'true'
 # Ngrok Auto-Start Configuration
 NGROK_AUTO_START = os.environ.get('NGROK_AUTO_START', 'True').lower() == 'true'
 
-# Auto-start ngrok for development
-if DEBUG and NGROK_AUTO_START:
-    try:
-        import ngrok_auto  # This will auto-start ngrok
-    except ImportError:
-        pass
+# Ngrok tunnel monitoring (seconds)
+NGROK_HEALTH_INTERVAL = int(os.environ.get('NGROK_HEALTH_INTERVAL', '30'))
+NGROK_HEALTH_HTTP_TIMEOUT = float(os.environ.get('NGROK_HEALTH_HTTP_TIMEOUT', '5'))
+NGROK_STARTUP_DEADLINE_S = float(os.environ.get('NGROK_STARTUP_DEADLINE_S', '15'))
 
 # Together AI API settings
 try:
@@ -10,13 +10,88 @@ import os
 import sys
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import subprocess
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 logger = logging.getLogger(__name__)
 
+NGROK_TUNNELS_URL = 'http://localhost:4040/api/tunnels'
+NGROK_API_PORTS = (4040, 4041, 4042)  # Common ngrok agent API ports
+NGROK_PROCESS_POLL_INTERVAL = 1  # Seconds between checks that the ngrok child is alive
+NGROK_CLEANUP_DEDUPE_WINDOW = 10  # Seconds during which a repeated process sweep is skipped
+NGROK_CONNECT_TIMEOUT = 0.2  # The agent is local, so a refused connect should fail fast
+
+
+def _ngrok_setting(name, default, minimum):
+    """Read a numeric ngrok tuning setting, clamping values below the minimum."""
+    value = getattr(settings, name, default)
+    if value < minimum:
+        logger.warning("[WARNING] %s=%s is below the minimum of %s, using %s", name, value, minimum, minimum)
+        return minimum
+    return value
+
+
+# Keep-alive session for the local ngrok agent API
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+# Short-lived cache of the agent's /api/tunnels response shared by all callers
+_tunnels_cache = {'fetched_at': 0.0, 'tunnels': None}
+_tunnels_lock = threading.Lock()
+
+
+def _fetch_tunnels(timeout=5, ttl=2.0):
+    """Return the ngrok agent's tunnel list, reusing a response younger than ttl seconds."""
+    with _tunnels_lock:
+        if _tunnels_cache['tunnels'] is not None and time.monotonic() - _tunnels_cache['fetched_at'] < ttl:
+            return _tunnels_cache['tunnels']
+    
+    response = _session.get(NGROK_TUNNELS_URL, timeout=(NGROK_CONNECT_TIMEOUT, timeout))
+    response.raise_for_status()
+    tunnels = response.json().get('tunnels', [])
+    
+    with _tunnels_lock:
+        _tunnels_cache['fetched_at'] = time.monotonic()
+        _tunnels_cache['tunnels'] = tunnels
+    return tunnels
+
+
+def _invalidate_tunnels():
+    """Drop the cached tunnel list after the agent's tunnels change."""
+    with _tunnels_lock:
+        _tunnels_cache['tunnels'] = None
+
+
+def _ngrok_is_running():
+    """Whether an ngrok agent is answering on its local API port."""
+    try:
+        return _session.get(NGROK_TUNNELS_URL, timeout=(NGROK_CONNECT_TIMEOUT, 0.2)).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+def _kill_ngrok_processes():
+    """Kill all ngrok processes and report whether any were found."""
+    if sys.platform == 'win32':
+        # taskkill exits with 128 when no process matched
+        result = subprocess.run(['taskkill', '/f', '/im', 'ngrok.exe'],
+                                capture_output=True, check=False)
+    else:
+        # pkill exits with 1 when no process matched
+        result = subprocess.run(['pkill', '-f', 'ngrok'],
+                                capture_output=True, check=False)
+    return result.returncode == 0
+
+
 class NgrokManager:
     """Manages ngrok tunnel lifecycle."""
     
@@ -25,6 +100,9 @@ class NgrokManager:
         self.public_url = None
         self.callback_url = None
         self.is_running = False
+        self._stop_event = threading.Event()
+        self._health_thread = None
+        self._last_cleaned = None
         
     def start_tunnel(self, port=8000):
         """Start ngrok tunnel automatically."""
@@ -33,11 +111,13 @@ class NgrokManager:
             logger.info("[CLEANUP] Performing clean startup...")
             self.stop_tunnel()
             
-            # Additional cleanup
-            self._deep_cleanup()
+            # Additional cleanup, only needed when a previous agent is still up
+            if _ngrok_is_running():
+                self._deep_cleanup()
             
             # Reset all state
             self._reset_state()
+            self._stop_event.clear()
             
             logger.info("[START] Starting fresh ngrok tunnel on port %s...", port)
             
@@ -49,11 +129,10 @@ class NgrokManager:
                 text=True,
                 creationflags=subprocess.CREATE_NEW_CONSOLE if sys.platform == 'win32' else 0
             )
+            # A new agent is running, so the next cleanup must sweep again
+            self._last_cleaned = None
             
-            # Wait for tunnel to establish
-            time.sleep(4)
-            
-            # Get public URL
+            # Wait for tunnel to establish and get public URL
             self.public_url = self._get_public_url()
             
             if self.public_url:
@@ -79,19 +158,16 @@ class NgrokManager:
             return False
     
     def _cleanup_existing_processes(self):
-        """Kill existing ngrok processes."""
+        """Kill existing ngrok processes, once per startup sequence."""
+        if self._last_cleaned is not None and time.monotonic() - self._last_cleaned < NGROK_CLEANUP_DEDUPE_WINDOW:
+            return
+        
         try:
-            if sys.platform == 'win32':
-                # Kill all ngrok processes
-                subprocess.run(['taskkill', '/f', '/im', 'ngrok.exe'], 
-                             capture_output=True, check=False)
+            if _kill_ngrok_processes():
                 # Wait a moment for processes to terminate
                 time.sleep(1)
-            else:
-                subprocess.run(['pkill', '-f', 'ngrok'], 
-                             capture_output=True, check=False)
-                time.sleep(1)
-            logger.info("[CLEANUP] Cleaned up old ngrok processes")
+                logger.info("[CLEANUP] Cleaned up old ngrok processes")
+            self._last_cleaned = time.monotonic()
         except Exception as e:
             logger.warning("[WARNING] Error during process cleanup: %s", e)
     
@@ -101,26 +177,21 @@ class NgrokManager:
             # Clear any stuck tunnels by checking ngrok API
             for attempt in range(3):
                 try:
-                    response = requests.get('http://localhost:4040/api/tunnels', timeout=2)
-                    if response.status_code == 200:
-                        tunnels = response.json().get('tunnels', [])
-                        for tunnel in tunnels:
-                            tunnel_name = tunnel.get('name')
-                            if tunnel_name:
-                                # Try to delete the tunnel
-                                requests.delete(f'http://localhost:4040/api/tunnels/{tunnel_name}', timeout=2)
-                        logger.info("[CLEANUP] Cleared existing tunnel configurations")
-                        break
+                    tunnels = _fetch_tunnels(timeout=2)
+                    urls = [f'{NGROK_TUNNELS_URL}/{t["name"]}' for t in tunnels if t.get('name')]
+                    if urls:
+                        # Delete all tunnels concurrently so a hung agent costs one timeout, not one per tunnel
+                        with ThreadPoolExecutor(max_workers=min(4, len(urls))) as executor:
+                            list(executor.map(
+                                lambda url: _session.delete(url, timeout=(NGROK_CONNECT_TIMEOUT, 2)), urls
+                            ))
+                    _invalidate_tunnels()
+                    logger.info("[CLEANUP] Cleared existing tunnel configurations")
+                    break
                 except:
                     time.sleep(0.5)
                     continue
             
-            # Kill any remaining processes
-            self._cleanup_existing_processes()
-            
-            # Wait for cleanup to complete
-            time.sleep(2)
-            
         except Exception as e:
             logger.warning("[WARNING] Deep cleanup warning: %s", e)
     
@@ -130,24 +201,33 @@ class NgrokManager:
         self.public_url = None
         self.callback_url = None
         self.is_running = False
+        _invalidate_tunnels()
         logger.info("[RESET] State reset completed")
     
-    def _get_public_url(self):
-        """Get the public URL from ngrok API."""
-        for attempt in range(10):  # Try for 10 seconds
-            try:
-                response = requests.get('http://localhost:4040/api/tunnels', timeout=5)
-                if response.status_code == 200:
-                    tunnels = response.json()['tunnels']
-                    
-                    for tunnel in tunnels:
-                        if tunnel['proto'] == 'https':
-                            return tunnel['public_url']
-            except:
-                time.sleep(1)
-                continue
+    def _get_public_url(self, timeout=None):
+        """Poll the ngrok API with backoff until the HTTPS tunnel is up."""
+        if timeout is None:
+            timeout = _ngrok_setting('NGROK_STARTUP_DEADLINE_S', 15, 1)
+        deadline = time.monotonic() + timeout
+        delay = 0.05
         
-        return None
+        while True:
+            try:
+                # Always fetch fresh while waiting for the tunnel to appear
+                for tunnel in _fetch_tunnels(timeout=0.5, ttl=0):
+                    if tunnel['proto'] == 'https':
+                        return tunnel['public_url']
+            except Exception:
+                pass
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            
+            # Wake immediately if the tunnel is stopped during startup
+            if self._stop_event.wait(min(delay, remaining)):
+                return None
+            delay = min(delay * 2, 1.0)
     
     def _update_settings(self):
         """Update Django settings with the new callback URL."""
@@ -160,22 +240,47 @@ class NgrokManager:
     
     def _start_health_check(self):
         """Start a background thread to monitor tunnel health."""
+        # One checker per manager; it keeps running across restarts
+        if self._health_thread and self._health_thread.is_alive():
+            return
+        
+        interval = _ngrok_setting('NGROK_HEALTH_INTERVAL', 30, 2)
+        http_timeout = _ngrok_setting('NGROK_HEALTH_HTTP_TIMEOUT', 5, 0.5)
+        
         def health_check():
-            while self.is_running:
+            next_probe = time.monotonic() + interval
+            
+            # stop_tunnel() sets the event so the loop exits at once. A restart
+            # runs on this thread and clears the event again, so monitoring
+            # carries on against the new tunnel.
+            while not self._stop_event.wait(NGROK_PROCESS_POLL_INTERVAL):
+                # A crashed agent is visible from the child process without any HTTP call
+                process = self.process
+                returncode = process.poll() if process else None
+                if returncode is not None:
+                    logger.warning("[WARNING] Ngrok process exited with code %s, attempting restart...", returncode)
+                    self.restart_tunnel()
+                    next_probe = time.monotonic() + interval
+                    continue
+                
+                if time.monotonic() < next_probe:
+                    continue
+                next_probe = time.monotonic() + interval
+                
                 try:
                     # Check if tunnel is still active
-                    response = requests.get('http://localhost:4040/api/tunnels', timeout=5)
-                    if response.status_code != 200:
-                        logger.warning("[WARNING] Ngrok tunnel may be down, attempting restart...")
-                        self.restart_tunnel()
+                    _fetch_tunnels(timeout=http_timeout)
+                except requests.HTTPError:
+                    logger.warning("[WARNING] Ngrok tunnel may be down, attempting restart...")
+                    self.restart_tunnel()
+                    next_probe = time.monotonic() + interval
                 except:
                     logger.warning("[WARNING] Ngrok health check failed, attempting restart...")
                     self.restart_tunnel()
-                
-                time.sleep(30)  # Check every 30 seconds
+                    next_probe = time.monotonic() + interval
         
-        thread = threading.Thread(target=health_check, daemon=True)
-        thread.start()
+        self._health_thread = threading.Thread(target=health_check, daemon=True)
+        self._health_thread.start()
     
     def restart_tunnel(self, port=8000):
         """Restart the ngrok tunnel."""
@@ -188,6 +293,7 @@ class NgrokManager:
         """Stop the ngrok tunnel."""
         logger.info("[STOP] Stopping ngrok tunnel...")
         self.is_running = False
+        self._stop_event.set()
         
         if self.process:
             try:
@@ -196,13 +302,14 @@ class NgrokManager:
                 
                 # Wait for graceful termination
                 try:
-                    self.process.wait(timeout=10)
+                    # ngrok exits on SIGTERM well within a second
+                    self.process.wait(timeout=2)
                     logger.info("[SUCCESS] Ngrok process terminated gracefully")
                 except subprocess.TimeoutExpired:
                     # Force kill if it doesn't terminate gracefully
                     logger.warning("[WARNING] Ngrok didn't terminate gracefully, force killing...")
                     self.process.kill()
-                    self.process.wait()
+                    self.process.wait(timeout=1)
                     logger.info("[SUCCESS] Ngrok process force killed")
                     
             except Exception as e:
@@ -221,6 +328,7 @@ class NgrokManager:
         # Reset state
         self.public_url = None
         self.callback_url = None
+        _invalidate_tunnels()
         
         logger.info("[STOP] Ngrok tunnel stopped completely")
     
@@ -232,6 +340,11 @@ class NgrokManager:
 ngrok_manager = NgrokManager()
 _ngrok_started = False  # Flag to prevent duplicate starts
 
+def _write_banner(*lines):
+    """Write a console banner with a single write and flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
 def start_ngrok_auto(port=8000):
     """Start ngrok automatically when Django starts."""
     global _ngrok_started
@@ -244,9 +357,11 @@ def start_ngrok_auto(port=8000):
         return
     
     try:
-        print("=" * 60)
-        print("[CLEANUP] CLEANING UP PREVIOUS NGROK SESSIONS...")
-        print("=" * 60)
+        _write_banner(
+            "=" * 60,
+            "[CLEANUP] CLEANING UP PREVIOUS NGROK SESSIONS...",
+            "=" * 60,
+        )
         
         # Pre-startup cleanup - ensure no lingering processes
         _perform_pre_startup_cleanup()
@@ -265,19 +380,23 @@ def start_ngrok_auto(port=8000):
         _ngrok_started = True  # Mark as started
         
         if success:
-            print("=" * 60)
-            print("[SUCCESS] NGROK TUNNEL ACTIVE")
-            print(f"[LOCAL]     http://localhost:{port}")
-            print(f"[PUBLIC]    {ngrok_manager.public_url}")
-            print(f"[CALLBACK]  {ngrok_manager.callback_url}")
-            print("=" * 60)
-            print("[SUCCESS] Angel One API calls will now work!")
-            print("[INFO] Use this callback URL in Angel One portal:")
-            print(f"   {ngrok_manager.callback_url}")
-            print("=" * 60)
+            _write_banner(
+                "=" * 60,
+                "[SUCCESS] NGROK TUNNEL ACTIVE",
+                f"[LOCAL]     http://localhost:{port}",
+                f"[PUBLIC]    {ngrok_manager.public_url}",
+                f"[CALLBACK]  {ngrok_manager.callback_url}",
+                "=" * 60,
+                "[SUCCESS] Angel One API calls will now work!",
+                "[INFO] Use this callback URL in Angel One portal:",
+                f"   {ngrok_manager.callback_url}",
+                "=" * 60,
+            )
         else:
-            print("[ERROR] Failed to start ngrok tunnel")
-            print("[INFO] You can start it manually: ngrok http " + str(port))
+            _write_banner(
+                "[ERROR] Failed to start ngrok tunnel",
+                "[INFO] You can start it manually: ngrok http " + str(port),
+            )
     
     except Exception as e:
         logger.error("[ERROR] Error in auto-start: %s", e)
@@ -285,47 +404,59 @@ def start_ngrok_auto(port=8000):
 def _perform_pre_startup_cleanup():
     """Perform comprehensive cleanup before starting."""
     try:
-        # Kill all ngrok processes
-        if sys.platform == 'win32':
-            subprocess.run(['taskkill', '/f', '/im', 'ngrok.exe'], 
-                         capture_output=True, check=False)
-        else:
-            subprocess.run(['pkill', '-f', 'ngrok'], 
-                         capture_output=True, check=False)
-        
-        # Wait for processes to terminate
-        time.sleep(2)
+        # Kill all ngrok processes; start_tunnel() reuses this sweep
+        ngrok_manager._cleanup_existing_processes()
         
         # Try to clear any API connections
-        for port in [4040, 4041, 4042]:  # Common ngrok ports
+        live_ports = set()
+        for port in NGROK_API_PORTS:
             try:
-                requests.get(f'http://localhost:{port}/api/tunnels', timeout=1)
+                _session.get(f'http://localhost:{port}/api/tunnels', timeout=(NGROK_CONNECT_TIMEOUT, 1))
                 # If we can connect, there's still an ngrok instance running
                 logger.warning("[WARNING] Found ngrok instance on port %s, terminating...", port)
-                if sys.platform == 'win32':
-                    subprocess.run(f'netstat -ano | findstr :{port}', shell=True, capture_output=True)
+                live_ports.add(port)
             except:
                 pass  # Port not in use, which is good
         
+        if live_ports:
+            _terminate_listeners(live_ports)
+        
         print("[SUCCESS] Pre-startup cleanup completed")
         
     except Exception as e:
         logger.warning("[WARNING] Pre-startup cleanup warning: %s", e)
 
+def _terminate_listeners(ports):
+    """Terminate processes still listening on the given local ports."""
+    if psutil is None:
+        logger.warning("[WARNING] psutil not installed, cannot terminate listeners on %s", sorted(ports))
+        return
+    
+    for conn in psutil.net_connections(kind='inet'):
+        if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.laddr.port in ports and conn.pid:
+            try:
+                psutil.Process(conn.pid).terminate()
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                logger.warning("[WARNING] Could not terminate process %s: %s", conn.pid, e)
+
 def stop_ngrok_auto():
     """Stop ngrok when Django shuts down."""
     global _ngrok_started
     
     if _ngrok_started:
-        print("\n" + "=" * 60)
-        print("[SHUTDOWN] SHUTTING DOWN NGROK TUNNEL...")
-        print("=" * 60)
+        _write_banner(
+            "\n" + "=" * 60,
+            "[SHUTDOWN] SHUTTING DOWN NGROK TUNNEL...",
+            "=" * 60,
+        )
         
         ngrok_manager.stop_tunnel()
         _ngrok_started = False
         
-        print("[SUCCESS] Ngrok tunnel stopped gracefully")
-        print("=" * 60)
+        _write_banner(
+            "[SUCCESS] Ngrok tunnel stopped gracefully",
+            "=" * 60,
+        )
 
 def setup_signal_handlers():
     """Setup signal handlers for graceful shutdown."""
@@ -347,16 +478,15 @@ def setup_signal_handlers():
         except AttributeError:
             pass
 
-# Auto-start when this module is imported
-if 'runserver' in sys.argv:
-    # Only start for development server
+def autostart(port=8000):
+    """Start ngrok for the development server and stop it on exit."""
     import atexit
     
     # Setup signal handlers for graceful shutdown
     setup_signal_handlers()
     
     # Start ngrok
-    start_ngrok_auto()
+    start_ngrok_auto(port)
     
     # Register cleanup for normal exit
     atexit.register(stop_ngrok_auto)